@@ -1,21 +1,21 @@
 import logging
 
-import uvicorn
-from dotenv import load_dotenv
-from fastapi_mcp import FastApiMCP
-
-from obsidian_api.api import app
-
 logging.basicConfig()
 
-mcp = FastApiMCP(app, "Personal knowledge vault")
-mcp.mount_http()
-
 
 def main():
+    import uvicorn
+    from dotenv import load_dotenv
+
     _ = load_dotenv()
 
-    uvicorn.run("obsidian_api.api:app", reload=True, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        "obsidian_api.api:create_mcp_app",
+        factory=True,
+        reload=True,
+        host="0.0.0.0",
+        port=8000,
+    )
 
 
 if __name__ == "__main__":
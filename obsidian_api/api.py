@@ -1,19 +1,71 @@
+import asyncio
+from contextlib import asynccontextmanager
+from os import getenv
+
 from fastapi import FastAPI
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse
+
+from .compression import CompressionMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app):
+    from .loader import maintain_vault
+    from .routes import vault_loader
+
+    # Load the vault once the server is up, instead of on the first request.
+    vault_loader.start()
+
+    interval = float(getenv("OBSIDIAN_REFRESH_INTERVAL", "5"))
+    maintenance = asyncio.create_task(maintain_vault(vault_loader, interval))
+    yield
+    maintenance.cancel()
 
 
 def create_app():
-    from .routes import router
+    from .routes import diagnostics_router, graph_router, router, vault_loader
 
-    app = FastAPI()
+    app = FastAPI(lifespan=lifespan)
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=int(getenv("OBSIDIAN_COMPRESSION_MIN_SIZE", "1024")),
+    )
 
     @app.get("/")
     async def index():
         return RedirectResponse("/docs")
 
+    @app.get("/healthz", include_in_schema=False)
+    async def healthz():
+        return {"status": "ok"}
+
+    @app.get("/readyz", include_in_schema=False)
+    async def readyz():
+        if vault_loader.ready:
+            return {"status": "ready", "generation": vault_loader.generation}
+        status = "error" if vault_loader.error else "loading"
+        return JSONResponse({"status": status}, status_code=503)
+
     app.include_router(router, prefix="/notes")
+    app.include_router(graph_router, prefix="/graph")
+    app.include_router(diagnostics_router, prefix="/diagnostics")
+
+    return app
+
+
+def create_mcp_app():
+    from fastapi_mcp import FastApiMCP
 
+    app = create_app()
+    mcp = FastApiMCP(app, "Personal knowledge vault")
+    mcp.mount_http()
     return app
 
 
-app = create_app()
+def __getattr__(name):
+    # Create `app` on first use so importing this module stays cheap.
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
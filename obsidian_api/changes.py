@@ -0,0 +1,110 @@
+import asyncio
+import json
+import time
+import uuid
+from collections import deque
+
+
+class ChangeJournal:
+    """
+    A bounded, in-memory log of notes being created, modified and deleted.
+
+    Every event gets the next sequence number, so clients can ask for
+    everything after the last number they saw. Only the most recent
+    `capacity` events are kept; a client that falls further behind than that
+    has to resync from the full list of notes. `epoch` changes whenever the
+    journal is recreated, such as on restart, which also requires a resync.
+    """
+
+    def __init__(self, capacity=10000):
+        self.epoch = uuid.uuid4().hex
+        self.sequence = 0
+        self.events = deque(maxlen=capacity)
+        self._changed = asyncio.Event()
+
+    def record(self, kind, slug):
+        self.sequence += 1
+        self.events.append(
+            {
+                "sequence": self.sequence,
+                "type": kind,
+                "slug": slug,
+                "timestamp": time.time(),
+            }
+        )
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def since(self, sequence, epoch=None, limit=None):
+        """
+        Return `(events, reset)` for events after `sequence`, oldest first.
+
+        `reset` is True when events after `sequence` have already been dropped,
+        or `sequence` is from a different `epoch`, so the client must resync.
+        """
+        if epoch is not None and epoch != self.epoch:
+            return [], True
+
+        oldest = self.events[0]["sequence"] if self.events else self.sequence + 1
+        if sequence > self.sequence or sequence < oldest - 1:
+            return [], True
+
+        events = []
+        for event in reversed(self.events):
+            if event["sequence"] <= sequence:
+                break
+            events.append(event)
+        events.reverse()
+        return events[:limit], False
+
+    async def wait(self, sequence, timeout):
+        """Wait up to `timeout` seconds for an event after `sequence`."""
+        if self.sequence > sequence:
+            return
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except TimeoutError:
+            pass
+
+
+def parse_event_id(event_id):
+    """
+    Split a server-sent event id into its epoch and sequence number.
+
+    Ids that are not of the form `epoch:sequence` get an empty epoch, which
+    never matches, so the client is told to resync.
+    """
+    epoch, _, sequence = event_id.rpartition(":")
+    try:
+        return epoch, int(sequence)
+    except ValueError:
+        return "", 0
+
+
+async def stream_changes(journal, since, epoch=None, keep_alive=15.0):
+    """
+    Yield the journal as server-sent events, starting after `since`.
+
+    Each change is sent as a `change` event whose id is `epoch:sequence`, so
+    a client reconnecting with Last-Event-ID after a restart is told to
+    resync. A `reset` event tells the client to resync, and a comment is sent
+    every `keep_alive` seconds without changes to hold the connection open.
+    """
+    sequence = since
+    while True:
+        events, reset = journal.since(sequence, epoch)
+        epoch = journal.epoch
+        if reset:
+            sequence = journal.sequence
+            data = json.dumps({"epoch": epoch, "sequence": sequence})
+            yield f"id: {epoch}:{sequence}\nevent: reset\ndata: {data}\n\n"
+            continue
+
+        for event in events:
+            sequence = event["sequence"]
+            data = json.dumps(event)
+            yield f"id: {epoch}:{sequence}\nevent: change\ndata: {data}\n\n"
+
+        await journal.wait(sequence, keep_alive)
+        if journal.sequence == sequence:
+            yield ": keep-alive\n\n"
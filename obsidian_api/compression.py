@@ -0,0 +1,111 @@
+import gzip
+
+try:
+    from compression import zstd  # Python 3.14+
+
+    zstd_compress = zstd.compress
+except ImportError:
+    try:
+        import zstandard
+
+        zstd_compress = zstandard.ZstdCompressor().compress
+    except ImportError:  # zstd is optional; gzip is always available
+        zstd_compress = None
+
+
+def gzip_compress(data):
+    return gzip.compress(data, compresslevel=6)
+
+
+COMPRESSORS = {"gzip": gzip_compress}
+if zstd_compress is not None:
+    COMPRESSORS = {"zstd": zstd_compress, **COMPRESSORS}
+
+
+def negotiate_encoding(accept_encoding, available=COMPRESSORS):
+    """Pick the preferred available encoding from an Accept-Encoding header."""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    best = None
+    for encoding in available:  # in order of server preference
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > 0 and (best is None or quality > best[1]):
+            best = (encoding, quality)
+    return best and best[0]
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with zstd or gzip, whichever the client prefers.
+
+    Bodies smaller than `minimum_size` bytes are sent as is, as are streaming
+    responses such as server-sent events, which must not be buffered.
+    """
+
+    def __init__(self, app, minimum_size=1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        encoding = negotiate_encoding(headers.get(b"accept-encoding", b"").decode())
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        body = []
+        passthrough = False
+
+        async def compressing_send(message):
+            nonlocal start, passthrough
+
+            if message["type"] == "http.response.start":
+                response_headers = dict(message.get("headers", []))
+                content_type = response_headers.get(b"content-type", b"")
+                if b"content-encoding" in response_headers or content_type.startswith(
+                    b"text/event-stream"
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            data = b"".join(body)
+            response_headers = [
+                (name, value)
+                for name, value in start.get("headers", [])
+                if name != b"content-length"
+            ]
+            if len(data) >= self.minimum_size:
+                data = COMPRESSORS[encoding](data)
+                response_headers.append((b"content-encoding", encoding.encode()))
+                response_headers.append((b"vary", b"Accept-Encoding"))
+            response_headers.append((b"content-length", str(len(data)).encode()))
+
+            await send({**start, "headers": response_headers})
+            await send({"type": "http.response.body", "body": data})
+
+        await self.app(scope, receive, compressing_send)
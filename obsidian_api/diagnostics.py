@@ -0,0 +1,51 @@
+import sys
+
+from obsidian_api.note import Note
+
+
+def deep_sizeof(obj, seen):
+    """Size of `obj` and everything it contains, counting shared objects once."""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    # Containers are copied in one step before walking them, as the report
+    # runs on a worker thread while refreshes may change the vault.
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(
+            deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in tuple(obj.items())
+        )
+    elif isinstance(obj, (list, set)):
+        size += sum(deep_sizeof(item, seen) for item in tuple(obj))
+    elif isinstance(obj, (tuple, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+def memory_report(vault):
+    """Estimate the memory held by the vault's notes and indexes, in bytes."""
+    seen = set()
+    notes = tuple(vault.notes.values())
+
+    fields = dict.fromkeys(Note.__slots__, 0)
+    objects = 0
+    for note in notes:
+        seen.add(id(note))
+        objects += sys.getsizeof(note)
+        for name in Note.__slots__:
+            fields[name] += deep_sizeof(getattr(note, name), seen)
+
+    note_bytes = objects + sum(fields.values())
+    return {
+        "notes": len(notes),
+        "note_bytes": note_bytes,
+        "bytes_per_note": note_bytes // len(notes) if notes else 0,
+        "fields": {"object": objects, **fields},
+        "search_index_bytes": sum(
+            deep_sizeof(part, seen)
+            for part in (vault.index, vault.term_ids, vault.terms, vault.positions)
+        ),
+    }
@@ -4,3 +4,15 @@ class NoteMissingException(Exception):
 
 class DuplicateSlugDetected(Exception):
     pass
+
+
+class SectionMissingException(Exception):
+    pass
+
+
+class IndexNotReadyException(Exception):
+    pass
+
+
+class NoteChangedException(Exception):
+    pass
@@ -0,0 +1,277 @@
+from array import array
+
+import numpy as np
+
+
+class LinkGraph:
+    """
+    Precomputed view of the links between notes in a vault.
+
+    Notes are numbered in vault order and links are stored as compressed
+    adjacency arrays in both directions: the outgoing links of note `i` are
+    `out_targets[out_offsets[i]:out_offsets[i + 1]]`, and its backlinks are
+    `in_sources[in_offsets[i]:in_offsets[i + 1]]`. Self-links are ignored and
+    links that do not resolve to a note are kept aside as dangling links.
+    """
+
+    def __init__(self, slugs, adjacency, dangling=()):
+        self.slugs = list(slugs)
+        self.index = {slug: i for i, slug in enumerate(self.slugs)}
+        self.dangling = list(dangling)
+
+        self.out_offsets = array("i", [0])
+        self.out_targets = array("i")
+        for targets in adjacency:
+            self.out_targets.extend(targets)
+            self.out_offsets.append(len(self.out_targets))
+
+        self.out_degree = array(
+            "i", (b - a for a, b in zip(self.out_offsets, self.out_offsets[1:]))
+        )
+        self.in_degree = array("i", [0] * len(self.slugs))
+        for target in self.out_targets:
+            self.in_degree[target] += 1
+
+        self._build_backlinks()
+        self.pagerank = self._compute_pagerank()
+        self.components, self.component_of = self._compute_components()
+        self.orphans = [
+            slug
+            for i, slug in enumerate(self.slugs)
+            if self.in_degree[i] == 0 and self.out_degree[i] == 0
+        ]
+        self.rankings = {
+            "pagerank": sorted(range(len(self.slugs)), key=lambda i: -self.pagerank[i]),
+            "in_degree": sorted(
+                range(len(self.slugs)), key=lambda i: -self.in_degree[i]
+            ),
+            "out_degree": sorted(
+                range(len(self.slugs)), key=lambda i: -self.out_degree[i]
+            ),
+        }
+
+    @classmethod
+    def from_vault(cls, vault):
+        slugs = list(vault.notes)
+        index = {slug: i for i, slug in enumerate(slugs)}
+        adjacency = []
+        dangling = []
+
+        for slug in slugs:
+            targets = {}
+            for link in vault.notes[slug].links:
+                target = vault.resolve_link(link)
+                if target is None:
+                    dangling.append((slug, link))
+                elif target != slug:
+                    targets[index[target]] = None
+            adjacency.append(list(targets))
+
+        return cls(slugs, adjacency, dangling)
+
+    def outlinks(self, i):
+        return self.out_targets[self.out_offsets[i] : self.out_offsets[i + 1]]
+
+    def backlinks(self, i):
+        return self.in_sources[self.in_offsets[i] : self.in_offsets[i + 1]]
+
+    def neighbors(self, i, directed=False):
+        if directed:
+            return self.outlinks(i)
+        return self.outlinks(i) + self.backlinks(i)
+
+    def shortest_path(
+        self, source, target, max_hops=6, max_nodes=10000, directed=False
+    ):
+        """
+        Find a shortest chain of links from `source` to `target`.
+
+        Searches from both ends at once, always growing the smaller frontier.
+        When `directed` is set, only follows links forwards from `source` and
+        backlinks from `target`. Returns the path as a list of slugs, or None if
+        no path exists within `max_hops` links or `max_nodes` visited notes.
+        """
+        start, goal = self.index[source], self.index[target]
+        if start == goal:
+            return [source]
+
+        forward_parents, backward_parents = {start: -1}, {goal: -1}
+        forward_frontier, backward_frontier = [start], [goal]
+
+        for _ in range(max_hops):
+            if not forward_frontier or not backward_frontier:
+                return None
+
+            if len(forward_frontier) <= len(backward_frontier):
+                frontier, parents, others = (
+                    forward_frontier,
+                    forward_parents,
+                    backward_parents,
+                )
+                expand = self.outlinks if directed else self.neighbors
+            else:
+                frontier, parents, others = (
+                    backward_frontier,
+                    backward_parents,
+                    forward_parents,
+                )
+                expand = self.backlinks if directed else self.neighbors
+
+            next_frontier = []
+            for node in frontier:
+                for neighbor in expand(node):
+                    if neighbor in parents:
+                        continue
+                    parents[neighbor] = node
+                    if neighbor in others:
+                        return self._join_path(
+                            neighbor, forward_parents, backward_parents
+                        )
+                    next_frontier.append(neighbor)
+
+            if frontier is forward_frontier:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+
+            if len(forward_parents) + len(backward_parents) > max_nodes:
+                return None
+
+        return None
+
+    def neighborhood(self, slug, max_hops=1, max_nodes=200, directed=False):
+        """
+        Collect the notes within `max_hops` links of `slug`, breadth first.
+
+        Returns `(nodes, edges, truncated)` where nodes is a list of
+        `(slug, distance)` pairs, edges are `(i, j)` positions in that list for
+        each link between collected notes, and truncated is set when the
+        `max_nodes` budget cut the search short.
+        """
+        distances = {self.index[slug]: 0}
+        frontier = [self.index[slug]]
+        truncated = False
+
+        for hop in range(1, max_hops + 1):
+            next_frontier = []
+            for node in frontier:
+                for neighbor in self.neighbors(node, directed):
+                    if neighbor in distances:
+                        continue
+                    if len(distances) >= max_nodes:
+                        truncated = True
+                        break
+                    distances[neighbor] = hop
+                    next_frontier.append(neighbor)
+            frontier = next_frontier
+            if truncated or not frontier:
+                break
+
+        position = {node: i for i, node in enumerate(distances)}
+        edges = [
+            (position[node], position[target])
+            for node in distances
+            for target in self.outlinks(node)
+            if target in position
+        ]
+        nodes = [(self.slugs[node], distance) for node, distance in distances.items()]
+        return nodes, edges, truncated
+
+    def node_metrics(self, slug):
+        i = self.index[slug]
+        return {
+            "slug": slug,
+            "in_degree": self.in_degree[i],
+            "out_degree": self.out_degree[i],
+            "pagerank": self.pagerank[i],
+            "component": self.component_of[i],
+        }
+
+    def top(self, by="pagerank", limit=10):
+        return [self.node_metrics(self.slugs[i]) for i in self.rankings[by][:limit]]
+
+    def stats(self):
+        return {
+            "notes": len(self.slugs),
+            "links": len(self.out_targets),
+            "dangling_links": len(self.dangling),
+            "orphans": len(self.orphans),
+            "components": len(self.components),
+        }
+
+    def _join_path(self, meeting, forward_parents, backward_parents):
+        path = []
+        node = meeting
+        while node != -1:
+            path.append(self.slugs[node])
+            node = forward_parents[node]
+        path.reverse()
+
+        node = backward_parents[meeting]
+        while node != -1:
+            path.append(self.slugs[node])
+            node = backward_parents[node]
+        return path
+
+    def _build_backlinks(self):
+        # Counting sort of the edge list by target.
+        self.in_offsets = array("i", [0])
+        for degree in self.in_degree:
+            self.in_offsets.append(self.in_offsets[-1] + degree)
+
+        cursor = array("i", self.in_offsets[:-1])
+        self.in_sources = array("i", [0] * len(self.out_targets))
+        for source in range(len(self.slugs)):
+            for target in self.outlinks(source):
+                self.in_sources[cursor[target]] = source
+                cursor[target] += 1
+
+    def _compute_pagerank(self, damping=0.85, max_iterations=100, tolerance=1e-9):
+        n = len(self.slugs)
+        if n == 0:
+            return array("d")
+
+        out_degree = np.asarray(self.out_degree, dtype=np.float64)
+        targets = np.asarray(self.out_targets, dtype=np.intp)
+        sources = np.repeat(np.arange(n), np.asarray(self.out_degree))
+        sinks = out_degree == 0
+        weights = np.divide(damping, out_degree, out=np.zeros(n), where=~sinks)
+
+        rank = np.full(n, 1.0 / n)
+        for _ in range(max_iterations):
+            base = (1.0 - damping + damping * rank[sinks].sum()) / n
+            updated = base + np.bincount(
+                targets, weights=(rank * weights)[sources], minlength=n
+            )
+            delta = np.abs(updated - rank).sum()
+            rank = updated
+            if delta < tolerance:
+                break
+        return array("d", rank.tolist())
+
+    def _compute_components(self):
+        """Weakly connected components, largest first."""
+        parent = list(range(len(self.slugs)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for source in range(len(self.slugs)):
+            for target in self.outlinks(source):
+                a, b = find(source), find(target)
+                if a != b:
+                    parent[max(a, b)] = min(a, b)
+
+        groups = {}
+        for i in range(len(self.slugs)):
+            groups.setdefault(find(i), []).append(self.slugs[i])
+
+        components = sorted(groups.values(), key=len, reverse=True)
+        component_of = array("i", [0] * len(self.slugs))
+        for number, members in enumerate(components):
+            for slug in members:
+                component_of[self.index[slug]] = number
+        return components, component_of
@@ -0,0 +1,35 @@
+from os import getenv
+
+
+class ResponseLimits:
+    """Server-side caps that keep responses, and the memory behind them, bounded."""
+
+    def __init__(
+        self,
+        max_batch_slugs=100,
+        max_total_chars=500_000,
+        max_results=1000,
+        max_graph_nodes=10_000,
+    ):
+        self.max_batch_slugs = max_batch_slugs
+        self.max_total_chars = max_total_chars
+        self.max_results = max_results
+        self.max_graph_nodes = max_graph_nodes
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_batch_slugs=int(getenv("OBSIDIAN_MAX_BATCH_SLUGS", "100")),
+            max_total_chars=int(getenv("OBSIDIAN_MAX_TOTAL_CHARS", "500000")),
+            max_results=int(getenv("OBSIDIAN_MAX_RESULTS", "1000")),
+            max_graph_nodes=int(getenv("OBSIDIAN_MAX_GRAPH_NODES", "10000")),
+        )
+
+    def chars_budget(self, requested=None):
+        if requested is None:
+            return self.max_total_chars
+        return min(requested, self.max_total_chars)
+
+    def snippet_chars(self, requested):
+        """Cap each snippet so a full page of results stays within the budget."""
+        return min(requested, max(1, self.max_total_chars // self.max_results))
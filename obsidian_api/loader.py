@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class VaultLoader:
+    """
+    Holds the vault for the app and loads it at most once.
+
+    `start` loads it on a background thread so the server can accept
+    connections straight away; until then `ready` is False. Requests that need
+    the vault before it is ready wait for the load in progress.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.generation = 0
+        self.error = None
+        self._vault = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self):
+        return self._vault is not None
+
+    def get(self):
+        if self._vault is None:
+            with self._lock:
+                if self._vault is None:
+                    self._load()
+        return self._vault
+
+    def start(self):
+        thread = threading.Thread(
+            target=self._warm_up, name="vault-warm-up", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def _load(self):
+        started = time.perf_counter()
+        try:
+            vault = self.factory()
+            vault.warm_up()
+        except Exception as ex:
+            self.error = ex
+            raise
+
+        self.error = None
+        self._vault = vault
+        self.generation += 1
+        logger.info(
+            f"Loaded {len(vault.notes)} notes in {time.perf_counter() - started:.2f}s"
+        )
+
+    def _warm_up(self):
+        try:
+            self.get()
+        except Exception:
+            logger.exception("Failed to load the vault")
+
+
+async def maintain_vault(loader, refresh_interval):
+    """
+    Finish loading the vault once it is ready, then keep it up to date.
+
+    Builds the semantic index off the event loop, and from then on applies
+    changes to the vault's files every `refresh_interval` seconds, unless it is
+    zero. Both run in this one task so they never update the vault at once.
+    """
+    try:
+        vault = await asyncio.to_thread(loader.get)
+    except Exception:
+        return  # Already logged by the warm-up
+
+    try:
+        await asyncio.to_thread(vault.build_semantic_index)
+    except Exception:
+        logger.exception("Failed to build the semantic index")
+
+    while refresh_interval > 0:
+        await asyncio.sleep(refresh_interval)
+        try:
+            # Scan, read and analyze the files off the event loop, but swap
+            # them in on it so requests never see the vault half way through
+            # a change.
+            changed, deleted = await asyncio.to_thread(vault.scan_changes)
+            prepared = await asyncio.to_thread(vault.prepare_changes, changed, deleted)
+            if vault.apply_changes(prepared, deleted):
+                loader.generation += 1
+                await asyncio.to_thread(vault.warm_up)
+        except Exception:
+            logger.exception("Failed to refresh the vault")
@@ -1,19 +1,196 @@
+import os
+import re
+import sys
+from collections import namedtuple
+
 import frontmatter
 
+from obsidian_api.exceptions import NoteChangedException
+
+# `[[target]]`, `[[target|alias]]`, `[[target#heading]]`, `[[target#^block]]`,
+# `[[folder/target]]` and embeds `![[target]]` all share this shape.
+WIKI_LINK_PATTERN = re.compile(r"!?\[\[([^\[\]\n]+?)\]\]")
+
+
+def normalize_link_target(raw):
+    """Reduce the inside of a wiki-link to the slug it points at."""
+    target = raw.split("|", 1)[0].split("#", 1)[0].rstrip("\\").strip()
+    target = target.rsplit("/", 1)[-1]
+    if target.endswith(".md"):
+        target = target[:-3]
+    return target
+
+
+# Files Obsidian embeds as attachments rather than notes.
+ATTACHMENT_EXTENSIONS = frozenset(
+    """
+    avif bmp gif jpeg jpg png svg webp
+    flac m4a mp3 ogg wav 3gp
+    mkv mov mp4 ogv webm
+    pdf canvas
+    """.split()
+)
+
+
+def is_attachment(target):
+    _, dot, extension = target.rpartition(".")
+    return bool(dot) and extension.lower() in ATTACHMENT_EXTENSIONS
+
+
+def parse_links(content):
+    """
+    Return the unique note targets in `content`, in order of appearance.
+
+    Targets differing only in case count once, keeping the first spelling, and
+    attachment embeds such as `![[photo.png]]` are left out.
+    """
+    links = {}
+    for match in WIKI_LINK_PATTERN.finditer(content):
+        target = normalize_link_target(match.group(1))
+        if target and not is_attachment(target):
+            links.setdefault(target.casefold(), sys.intern(target))
+    return list(links.values())
+
+
+def intern_frontmatter(value):
+    """Share keys and short string values, such as tags, between notes."""
+    if isinstance(value, dict):
+        return {
+            sys.intern(key) if isinstance(key, str) else key: intern_frontmatter(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [intern_frontmatter(item) for item in value]
+    if isinstance(value, str) and len(value) <= 64:
+        return sys.intern(value)
+    return value
+
+
+FRONTMATTER_PATTERN = re.compile(
+    rb"\A---[ \t]*\r?\n.*?^---[ \t]*(?:\r?\n|\Z)", re.S | re.M
+)
+
+# Headings outside code fences. Fence lines are matched so they can be tracked.
+OUTLINE_PATTERN = re.compile(
+    rb"^(?:(?P<fence>```|~~~)|(?P<hashes>#{1,6})[ \t]+(?P<title>.*?)[ \t#]*\r?$)",
+    re.M,
+)
+
+# A heading and the byte range of the file it covers, up to the next heading of
+# the same or a higher level. Level 0 is the text before the first heading.
+Section = namedtuple("Section", "level title start end line")
+
+
+def parse_outline(data):
+    """Build the heading outline of a note file from its raw bytes."""
+    match = FRONTMATTER_PATTERN.match(data)
+    body_start = match.end() if match else 0
+    body_line = line = data.count(b"\n", 0, body_start) + 1
+
+    headings = []
+    fence = None
+    position = body_start
+    for match in OUTLINE_PATTERN.finditer(data, body_start):
+        line += data.count(b"\n", position, match.start())
+        position = match.start()
+        if match["fence"]:
+            if fence is None:
+                fence = match["fence"]
+            elif fence == match["fence"]:
+                fence = None
+        elif fence is None:
+            title = sys.intern(match["title"].decode("utf-8", errors="replace"))
+            headings.append((len(match["hashes"]), title, match.start(), line))
+
+    outline = []
+    first = headings[0][2] if headings else len(data)
+    if data[body_start:first].strip():
+        outline.append(Section(0, "", body_start, first, body_line))
+
+    open_sections = []
+    for level, title, start, line in headings:
+        while open_sections and outline[open_sections[-1]].level >= level:
+            closed = open_sections.pop()
+            outline[closed] = outline[closed]._replace(end=start)
+        open_sections.append(len(outline))
+        outline.append(Section(level, title, start, len(data), line))
+    return outline
+
 
 class Note:
-    def __init__(self, slug, filename, text):
-        self.slug = slug
+    # Slotted, and without the raw text, to keep large vaults small in memory.
+    __slots__ = ("slug", "filepath", "frontmatter", "content", "links", "outline")
+
+    def __init__(self, slug, filename, text, outline=None):
+        self.slug = sys.intern(slug)
         self.filepath = filename
-        self.filename = filename.split("/")[-1]  # Strip path, keep only filename
-        self.text = text
-        self.frontmatter, self.content = frontmatter.parse(text)
+        metadata, self.content = frontmatter.parse(text)
+        self.frontmatter = intern_frontmatter(metadata)
+        self.links = tuple(parse_links(self.content))
+        if outline is None:
+            outline = parse_outline(text.encode())
+        self.outline = tuple(outline)
+
+    @property
+    def filename(self):
+        return self.filepath.split("/")[-1]  # Strip path, keep only filename
+
+    def find_section(self, heading):
+        """Return the first section whose title matches `heading`, ignoring case."""
+        heading = heading.strip().casefold()
+        for section in self.outline:
+            if section.level and section.title.casefold() == heading:
+                return section
+        return None
+
+    def line_range(self, start_line, end_line):
+        """Byte offsets spanning lines `start_line` to `end_line` (1-based, inclusive)."""
+        start = None
+        offset = 0
+        with open(self.filepath, "rb") as file:
+            for number, line in enumerate(file, 1):
+                if number == start_line:
+                    start = offset
+                offset += len(line)
+                if number == end_line:
+                    break
+        return offset if start is None else start, offset
+
+    def read_range(self, start, end, max_chars=None, stat=None):
+        """
+        Read bytes `start` to `end` of the note file straight from disk.
+
+        When `stat` is the `(mtime_ns, size)` the note was parsed from, raises
+        NoteChangedException if the file has changed since, as the offsets
+        may no longer match its content.
+
+        Returns the decoded text and whether it was cut short by `max_chars`.
+        """
+        length = max(end - start, 0)
+        if max_chars is not None:
+            # UTF-8 needs at most 4 bytes per character.
+            length = min(length, max_chars * 4)
+
+        with open(self.filepath, "rb") as file:
+            if stat is not None:
+                current = os.fstat(file.fileno())
+                if (current.st_mtime_ns, current.st_size) != stat:
+                    raise NoteChangedException(
+                        f"Note {self.slug} changed on disk since it was loaded"
+                    )
+            file.seek(start)
+            data = file.read(length)
+
+        text = data.decode("utf-8", errors="ignore").replace("\r\n", "\n")
+        truncated = length < end - start
+        if max_chars is not None and len(text) > max_chars:
+            text = text[:max_chars]
+            truncated = True
+        return text, truncated
 
     def extract_links(self):
         """Extract links from the note content."""
-        import re
-
-        return re.findall(r"\[\[(.*?)\]\]", self.content)
+        return list(self.links)
 
     def as_json(self):
         return {
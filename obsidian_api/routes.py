@@ -1,34 +1,87 @@
+from functools import lru_cache
 from os import getenv
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 
-from obsidian_api.exceptions import NoteMissingException
+from obsidian_api.changes import parse_event_id, stream_changes
+from obsidian_api.diagnostics import memory_report
+from obsidian_api.exceptions import (
+    IndexNotReadyException,
+    NoteChangedException,
+    NoteMissingException,
+    SectionMissingException,
+)
+from obsidian_api.limits import ResponseLimits
+from obsidian_api.loader import VaultLoader
 from obsidian_api.vault import ObsidianVault
 
 from .schema import (
     BatchGetNotesRequest,
+    ConnectedComponentsResponse,
+    DanglingLinksResponse,
     FindNoteLinksResponse,
+    FindPathResponse,
     FindRelevantNotesResponse,
+    FindSimilarNotesResponse,
     GetBatchNotesResponse,
+    GraphStatsResponse,
+    HubNotesResponse,
     ListNoteSlugsResponse,
+    MemoryReportResponse,
+    NeighborhoodResponse,
+    NoteChangesResponse,
+    NoteGraphMetrics,
+    NoteOutlineResponse,
+    OrphanNotesResponse,
+    ReadNoteSectionsRequest,
+    ReadNoteSectionsResponse,
     SearchNotesResponse,
 )
 
 router = APIRouter()
+graph_router = APIRouter()
+diagnostics_router = APIRouter()
 
 
-def get_vault():
+def load_vault():
     path = getenv("OBSIDIAN_VAULT_PATH", "tests/test_data")
     return ObsidianVault(directory=path)
 
 
+vault_loader = VaultLoader(load_vault)
+
+
+def get_vault():
+    return vault_loader.get()
+
+
+@lru_cache(maxsize=1)
+def get_limits():
+    return ResponseLimits.from_env()
+
+
 @router.get("/", response_model=ListNoteSlugsResponse)
-async def list_note_slugs(vault: ObsidianVault = Depends(get_vault)):
+async def list_note_slugs(
+    offset: int = Query(default=0, ge=0),
+    limit: int | None = Query(default=None, ge=1),
+    vault: ObsidianVault = Depends(get_vault),
+    limits: ResponseLimits = Depends(get_limits),
+):
     """
     Retrieve a comprehensive list of all note slugs in the vault.
 
     Provides an overview of all available notes by their unique identifiers.
 
+    Parameters:
+    -----------
+    offset : int, optional
+        Position in the list to start from. Default: 0
+
+    limit : int, optional
+        Maximum number of slugs to return, capped by the server.
+
     Returns:
     --------
     ListNoteSlugsResponse
@@ -37,7 +90,8 @@ async def list_note_slugs(vault: ObsidianVault = Depends(get_vault)):
     Response Structure:
     ------------------
     {
-        "results": [str]  # List of all note slugs
+        "results": [str],  # List of note slugs
+        "next_offset": int | null  # Offset of the next page, if any
     }
 
     Features:
@@ -66,15 +120,28 @@ async def list_note_slugs(vault: ObsidianVault = Depends(get_vault)):
 
     Notes:
     ------
-    - Number of results depends on vault size
+    - Large vaults are returned in pages; follow next_offset for the rest
     - No additional filtering applied
     """
-    return {"results": vault.list_note_slugs()}
+    slugs = vault.list_note_slugs()
+    limit = limits.max_results if limit is None else min(limit, limits.max_results)
+    end = offset + limit
+    return {
+        "results": slugs[offset:end],
+        "next_offset": end if end < len(slugs) else None,
+    }
 
 
 @router.get("/search", response_model=SearchNotesResponse)
 async def search_notes(
-    q: str, exact: bool = False, vault: ObsidianVault = Depends(get_vault)
+    q: str,
+    exact: bool = False,
+    mode: Literal["keyword", "semantic"] = "keyword",
+    limit: int = Query(default=10, ge=1),
+    snippets: bool = False,
+    snippet_chars: int = Query(default=160, ge=1),
+    vault: ObsidianVault = Depends(get_vault),
+    limits: ResponseLimits = Depends(get_limits),
 ):
     """
     Discovers notes matching a specific search query with flexible matching options.
@@ -83,7 +150,7 @@ async def search_notes(
     -----------
     q : str
         Search query to find matching notes.
-        - query must not exceed 2 words
+        - query must not exceed 2 words in keyword mode
         - Supports words, phrases, partial content
         - Case-insensitive
         - Searches entire note contents
@@ -97,19 +164,49 @@ async def search_notes(
           * Requires precise search term
           * Narrow, precise results
 
+    mode : str, optional
+        - "keyword" (default): Match the words of the query
+        - "semantic": Rank notes by similarity to the query as a whole
+          * Finds conceptually related notes that share few exact words
+          * Queries may be any length
+          * `exact` is ignored
+          * Returns 503 while the index is still being built after startup
+
+    limit : int, optional
+        Maximum number of results in semantic mode. Default: 10
+
+    snippets : bool, optional
+        Include an excerpt around the best match in each result, so the
+        note does not need to be fetched to see why it matched.
+        Default: False
+
+    snippet_chars : int, optional
+        Maximum length of each snippet, capped so that all snippets together
+        stay within the server's total response size. Default: 160
+
     Returns:
     --------
     {
         "params": {
             "query": str,
-            "exact": bool
+            "exact": bool,
+            "mode": str,
+            "limit": int,
+            "snippets": bool,
+            "snippet_chars": int
         },
         "results": [
             {
                 "slug": str,        # Matching note slug
                 "frontmatter": dict # Note's metadata dictionary
+                "score": float      # Similarity, semantic mode only
+                "snippet": {        # Only when snippets=true
+                    "text": str,
+                    "highlights": [[int, int]]  # Matched words in text
+                }
             }
-        ]
+        ],
+        "truncated": bool  # True if results were capped by the server
     }
 
     Search Modes:
@@ -122,6 +219,10 @@ async def search_notes(
        GET /search?q="neural networks"
        Returns only notes with exact phrase
 
+    3. Semantic Search:
+       GET /search?q=how do computers learn from data&mode=semantic
+       Returns the most similar notes, best match first
+
     Examples:
     ---------
     GET /search?q=python
@@ -148,20 +249,177 @@ async def search_notes(
         ]
     }
     """
-    if len(q.split()) > 2:
+    snippet_chars = limits.snippet_chars(snippet_chars)
+    snippet_limit = snippet_chars if snippets else None
+    # Ask for one extra result to find out whether the cap cut anything off.
+    max_results = limits.max_results + 1
+    if mode == "semantic":
+        try:
+            results = vault.semantic_search_notes(
+                q, min(limit, max_results), snippet_limit
+            )
+        except IndexNotReadyException as ex:
+            raise HTTPException(status_code=503, detail=str(ex))
+    elif len(q.split()) > 2:
         raise HTTPException(
             status_code=400, detail="Search query should not exceed 2 words"
         )
+    elif exact:
+        results = vault.search_notes(q, snippet_limit, max_results)
+    else:
+        results = vault.fuzzy_search_notes(q, snippet_limit, max_results)
 
     return {
         "params": {
             "query": q,
             "exact": exact,
+            "mode": mode,
+            "limit": limit,
+            "snippets": snippets,
+            "snippet_chars": snippet_chars,
         },
-        "results": vault.search_notes(q) if exact else vault.fuzzy_search_notes(q),
+        "results": results[: limits.max_results],
+        "truncated": len(results) > limits.max_results,
     }
 
 
+@router.get("/changes", response_model=NoteChangesResponse)
+async def list_note_changes(
+    since: int = Query(default=0, ge=0),
+    epoch: str | None = None,
+    limit: int | None = Query(default=None, ge=1),
+    wait: float = Query(default=0, ge=0),
+    vault: ObsidianVault = Depends(get_vault),
+    limits: ResponseLimits = Depends(get_limits),
+):
+    """
+    List notes created, modified or deleted since a point in the change feed.
+
+    Lets clients that mirror the vault stay in sync by fetching only what
+    changed, instead of listing and fetching every note again.
+
+    Parameters:
+    -----------
+    since : int, optional
+        Sequence number of the last change the client has seen.
+        - Default: 0 (all changes still in the journal)
+
+    epoch : str, optional
+        Epoch the client's sequence number belongs to. If it is not the
+        current epoch, for example after a restart, "reset" is true.
+
+    limit : int, optional
+        Maximum number of changes to return, capped by the server.
+
+    wait : float, optional
+        Seconds to wait for a change if there are none yet (long polling).
+        - Default: 0 (return immediately)
+        - Capped at 60 seconds
+
+    Returns:
+    --------
+    {
+        "params": {
+            "since": int,
+            "epoch": str | null,
+            "limit": int | null,
+            "wait": float
+        },
+        "epoch": str,     # Changes when the server restarts
+        "sequence": int,  # Latest sequence number in the journal
+        "events": [
+            {
+                "sequence": int,
+                "type": str,        # "created", "modified" or "deleted"
+                "slug": str,
+                "timestamp": float  # Unix time the change was detected
+            }
+        ],
+        "reset": bool,    # True if the client must resync
+        "truncated": bool,  # True if `limit` cut off later events
+        "next_since": int | null  # `since` for the rest, when truncated
+    }
+
+    Syncing:
+    --------
+    1. List all slugs with GET /notes and remember "sequence" and "epoch"
+       from GET /notes/changes
+    2. Poll GET /notes/changes?since=<last sequence seen>&epoch=<epoch>&wait=30
+    3. While "truncated" is true, fetch the rest with since=<next_since>
+    4. Resync from step 1 when "reset" is true
+
+    Notes:
+    ------
+    - Only a bounded number of recent changes is kept in memory
+    - Changes are detected by rescanning the vault periodically
+    """
+    events, reset = vault.changes.since(since, epoch)
+    if not events and not reset and wait > 0:
+        await vault.changes.wait(since, min(wait, 60))
+        events, reset = vault.changes.since(since, epoch)
+
+    limit = limits.max_results if limit is None else min(limit, limits.max_results)
+    truncated = len(events) > limit
+    events = events[:limit]
+    return {
+        "params": {
+            "since": since,
+            "epoch": epoch,
+            "limit": limit,
+            "wait": wait,
+        },
+        "epoch": vault.changes.epoch,
+        "sequence": vault.changes.sequence,
+        "events": events,
+        "reset": reset,
+        "truncated": truncated,
+        "next_since": events[-1]["sequence"] if truncated else None,
+    }
+
+
+@router.get("/changes/stream")
+async def stream_note_changes(
+    request: Request,
+    since: int | None = Query(default=None, ge=0),
+    epoch: str | None = None,
+    last_event_id: str | None = Header(default=None),
+    vault: ObsidianVault = Depends(get_vault),
+):
+    """
+    Stream changes to notes as server-sent events.
+
+    Parameters:
+    -----------
+    since : int, optional
+        Sequence number of the last change the client has seen. Defaults to
+        the Last-Event-ID header sent by reconnecting clients, or to the
+        current sequence number to receive only new changes.
+
+    epoch : str, optional
+        Epoch that `since` belongs to, as in /notes/changes.
+
+    Events:
+    -------
+    Each event's id is "<epoch>:<sequence>".
+    - change: One created, modified or deleted note, as in /notes/changes
+    - reset: Changes were missed, or the server restarted; resync, then
+      continue from "sequence"
+    """
+    if since is None:
+        if last_event_id is None:
+            since, epoch = vault.changes.sequence, vault.changes.epoch
+        else:
+            epoch, since = parse_event_id(last_event_id)
+
+    async def events():
+        async for message in stream_changes(vault.changes, since, epoch):
+            if await request.is_disconnected():
+                break
+            yield message
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
 @router.get("/{slug}/links", response_model=FindNoteLinksResponse)
 async def find_note_links(slug: str, vault: ObsidianVault = Depends(get_vault)):
     """
@@ -225,6 +483,7 @@ async def find_relevant_notes(
     max_hops: int = 2,
     char_limit: int = 100,
     vault: ObsidianVault = Depends(get_vault),
+    limits: ResponseLimits = Depends(get_limits),
 ):
     """
     Discover connected and contextually related notes.
@@ -247,6 +506,7 @@ async def find_relevant_notes(
         Maximum characters for note previews.
         - Default: 100 characters
         - Keeps results concise and scannable
+        - Capped by the server's total response size
 
     Returns:
     --------
@@ -267,7 +527,8 @@ async def find_relevant_notes(
                 "content_summary": str,
                 "distance": int
             }
-        ]
+        ],
+        "truncated": bool  # True if results were capped by the server
     }
 
     Features:
@@ -300,20 +561,250 @@ async def find_relevant_notes(
     - Check note's internal linking
     - Adjust max_hops for broader/narrower results
     """
-    relevant_notes = vault.find_relevant_notes(slug, max_hops, char_limit)
+    budget = limits.chars_budget()
+    relevant_notes = vault.find_relevant_notes(slug, max_hops, min(char_limit, budget))
+
+    results = []
+    for note in relevant_notes[: limits.max_results]:
+        budget -= len(note["content_summary"])
+        if budget < 0:
+            break
+        results.append(note)
+
     return {
         "params": {
             "slug": slug,
             "max_hops": max_hops,
             "char_limit": char_limit,
         },
-        "results": relevant_notes,
+        "results": results,
+        "truncated": len(results) < len(relevant_notes),
+    }
+
+
+@router.get("/{slug}/similar", response_model=FindSimilarNotesResponse)
+async def find_similar_notes(
+    slug: str,
+    limit: int = Query(default=10, ge=1),
+    vault: ObsidianVault = Depends(get_vault),
+    limits: ResponseLimits = Depends(get_limits),
+):
+    """
+    Find notes whose content is most similar to a given note.
+
+    Unlike /relevant, this does not rely on links: notes are compared by
+    what they say, so it also surfaces related notes that were never linked.
+
+    Parameters:
+    -----------
+    slug : str
+        Unique note identifier.
+
+    limit : int, optional
+        Maximum number of similar notes to return, capped by the server.
+        Default: 10
+
+    Returns:
+    --------
+    {
+        "params": {"slug": str, "limit": int},
+        "results": [
+            {
+                "slug": str,
+                "frontmatter": dict,
+                "score": float   # Similarity between 0 and 1
+            }
+        ]
+    }
+
+    Example:
+    --------
+    GET /notes/machine-learning/similar?limit=2
+    Response: {
+        "params": {"slug": "machine-learning", "limit": 2},
+        "results": [
+            {"slug": "deep-learning", "frontmatter": {...}, "score": 0.62},
+            {"slug": "statistics", "frontmatter": {...}, "score": 0.41}
+        ]
+    }
+
+    Errors:
+    -------
+    404 Error if note is not found
+    503 Error while the semantic index is still being built after startup
+    """
+    try:
+        results = vault.find_similar_notes(slug, min(limit, limits.max_results))
+    except NoteMissingException as ex:
+        raise HTTPException(status_code=404, detail=str(ex))
+    except IndexNotReadyException as ex:
+        raise HTTPException(status_code=503, detail=str(ex))
+
+    return {
+        "params": {
+            "slug": slug,
+            "limit": limit,
+        },
+        "results": results,
+    }
+
+
+@router.get("/{slug}/outline", response_model=NoteOutlineResponse)
+async def get_note_outline(slug: str, vault: ObsidianVault = Depends(get_vault)):
+    """
+    List the headings of a note and where each section lives in the file.
+
+    Use this before /notes/sections to fetch only the parts of a long note
+    that are needed.
+
+    Parameters:
+    -----------
+    slug : str
+        Unique note identifier.
+
+    Returns:
+    --------
+    {
+        "params": {"slug": str},
+        "sections": [
+            {
+                "level": int,       # 1-6 for headings, 0 for text before the first heading
+                "title": str,
+                "start_byte": int,  # Byte offsets in the note file
+                "end_byte": int,
+                "line": int         # Line the section starts on
+            }
+        ]
+    }
+
+    Notes:
+    ------
+    - A section runs until the next heading of the same or a higher level,
+      so it includes its subsections
+
+    Errors:
+    -------
+    404 Error if note is not found
+    """
+    try:
+        note = vault.fetch_note_by_slug(slug)
+    except NoteMissingException as ex:
+        raise HTTPException(status_code=404, detail=str(ex))
+
+    return {
+        "params": {
+            "slug": slug,
+        },
+        "sections": [
+            {
+                "level": section.level,
+                "title": section.title,
+                "start_byte": section.start,
+                "end_byte": section.end,
+                "line": section.line,
+            }
+            for section in note.outline
+        ],
+    }
+
+
+@router.post("/sections", response_model=ReadNoteSectionsResponse)
+async def read_note_sections(
+    request: ReadNoteSectionsRequest,
+    vault: ObsidianVault = Depends(get_vault),
+    limits: ResponseLimits = Depends(get_limits),
+):
+    """
+    Retrieve parts of one or more notes instead of their full content.
+
+    Parameters:
+    -----------
+    request : ReadNoteSectionsRequest
+        - sections: Parts to read, each with a 'slug' and at most one of
+            * heading: Title of a section, case-insensitive
+            * start_line / end_line: Line range, 1-based and inclusive
+            * start_byte / end_byte: Byte range from /notes/{slug}/outline
+          With none of these, the note's full content is returned.
+        - max_chars: Optional character budget shared by the whole batch,
+          capped by the server's total response size
+
+    Returns:
+    --------
+    {
+        "params": {...},
+        "results": [
+            {
+                "slug": str,
+                "heading": str | null,
+                "start_byte": int | null,
+                "end_byte": int | null,
+                "content": str,
+                "truncated": bool  # True if max_chars cut this part short
+            }
+        ]
+    }
+
+    Example:
+    --------
+    POST /notes/sections
+    Request body:
+    {
+        "sections": [
+            {"slug": "machine-learning", "heading": "Evaluation"},
+            {"slug": "data-science", "start_line": 1, "end_line": 10}
+        ],
+        "max_chars": 4000
+    }
+
+    Notes:
+    ------
+    - Sections are read directly from the note files on disk
+    - Once the budget is spent, remaining parts come back empty and truncated
+
+    Errors:
+    -------
+    - 400 Bad Request: Raised if too many sections are requested
+    - 404 Not Found: Raised if a note or heading does not exist
+    - 409 Conflict: Raised if a note file changed since it was loaded; its
+      outline is updated by the next refresh, so retry after a few seconds
+    """
+    if len(request.sections) > limits.max_batch_slugs:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch requests are limited to {limits.max_batch_slugs} sections",
+        )
+
+    remaining = limits.chars_budget(request.max_chars)
+    results = []
+    try:
+        for item in request.sections:
+            part = vault.read_note_section(
+                item.slug,
+                heading=item.heading,
+                start_line=item.start_line,
+                end_line=item.end_line,
+                start_byte=item.start_byte,
+                end_byte=item.end_byte,
+                max_chars=remaining,
+            )
+            remaining -= len(part["content"])
+            results.append({"slug": item.slug, "heading": item.heading, **part})
+    except (NoteMissingException, SectionMissingException) as ex:
+        raise HTTPException(status_code=404, detail=str(ex))
+    except NoteChangedException as ex:
+        raise HTTPException(status_code=409, detail=str(ex))
+
+    return {
+        "params": request,
+        "results": results,
     }
 
 
 @router.post("/details", response_model=GetBatchNotesResponse)
 async def get_notes_batch(
-    request: BatchGetNotesRequest, vault: ObsidianVault = Depends(get_vault)
+    request: BatchGetNotesRequest,
+    vault: ObsidianVault = Depends(get_vault),
+    limits: ResponseLimits = Depends(get_limits),
 ):
     """
     Retrieve details for multiple notes in a single batch request.
@@ -324,6 +815,7 @@ async def get_notes_batch(
         A request object containing a list of note slugs to retrieve.
         - Contains a 'slugs' field with unique note identifiers
         - Maximum number of slugs per request depends on server configuration
+          (OBSIDIAN_MAX_BATCH_SLUGS, default 100)
 
     Returns:
     --------
@@ -334,9 +826,13 @@ async def get_notes_batch(
             * slug: Unique identifier for the note
             * content: Full markdown content of the note
             * frontmatter: Metadata dictionary for the note
+            * truncated: True if the content was cut short
+        - remaining: Slugs left out because the response size cap was
+          reached; request them again to continue
 
     Errors:
     -------
+    - 400 Bad Request: Raised if too many slugs are requested
     - 404 Not Found: Raised if any of the specified notes do not exist in the vault
 
     Example:
@@ -372,14 +868,404 @@ async def get_notes_batch(
     - Useful for batch processing or fetching related notes
     - Ensures atomic retrieval of note details
     """
+    if len(request.slugs) > limits.max_batch_slugs:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch requests are limited to {limits.max_batch_slugs} slugs",
+        )
+
+    try:
+        notes = [vault.fetch_note_by_slug(slug) for slug in request.slugs]
+    except NoteMissingException as ex:
+        raise HTTPException(status_code=404, detail=str(ex))
+
+    budget = limits.chars_budget()
+    results = []
+    for note in notes:
+        details = note.as_json()
+        if len(details["content"]) > budget:
+            if results:
+                break
+            # Always return something, so a single huge note can still be read.
+            details["content"] = details["content"][:budget]
+            details["truncated"] = True
+        budget -= len(details["content"])
+        results.append(details)
+
+    return {
+        "params": request,
+        "results": results,
+        "remaining": request.slugs[len(results) :],
+    }
+
+
+@graph_router.get("/stats", response_model=GraphStatsResponse)
+async def graph_stats(vault: ObsidianVault = Depends(get_vault)):
+    """
+    Summarise the shape of the vault's link graph.
+
+    Returns:
+    --------
+    {
+        "notes": int,           # Number of notes in the vault
+        "links": int,           # Number of distinct links between notes
+        "dangling_links": int,  # Links pointing at notes that do not exist
+        "orphans": int,         # Notes with no links in or out
+        "components": int       # Number of connected clusters of notes
+    }
+
+    Notes:
+    ------
+    - Metrics are precomputed and cached until the vault is reindexed
+    """
+    return vault.graph.stats()
+
+
+@graph_router.get("/hubs", response_model=HubNotesResponse)
+async def graph_hubs(
+    by: Literal["pagerank", "in_degree", "out_degree"] = "pagerank",
+    limit: int = Query(default=10, ge=1),
+    vault: ObsidianVault = Depends(get_vault),
+    limits: ResponseLimits = Depends(get_limits),
+):
+    """
+    Find the most central notes in the vault.
+
+    Parameters:
+    -----------
+    by : str, optional
+        Ranking metric.
+        - "pagerank" (default): Importance based on who links to a note
+        - "in_degree": Number of notes linking to a note
+        - "out_degree": Number of notes a note links to
+
+    limit : int, optional
+        Maximum number of notes to return, capped by the server. Default: 10
+
+    Returns:
+    --------
+    {
+        "params": {"by": str, "limit": int},
+        "results": [
+            {
+                "slug": str,
+                "in_degree": int,
+                "out_degree": int,
+                "pagerank": float,
+                "component": int   # Index into /graph/components
+            }
+        ]
+    }
+
+    Example:
+    --------
+    GET /graph/hubs?by=in_degree&limit=3
+
+    Use Cases:
+    ----------
+    - Finding entry points into the vault
+    - Identifying the main topics of a knowledge base
+    """
+    return {
+        "params": {"by": by, "limit": limit},
+        "results": vault.graph.top(by, min(limit, limits.max_results)),
+    }
+
+
+@graph_router.get("/orphans", response_model=OrphanNotesResponse)
+async def graph_orphans(
+    vault: ObsidianVault = Depends(get_vault),
+    limits: ResponseLimits = Depends(get_limits),
+):
+    """
+    List notes that neither link to, nor are linked from, any other note.
+
+    Returns:
+    --------
+    {
+        "results": [str],  # Slugs of orphaned notes
+        "truncated": bool  # True if results were capped by the server
+    }
+
+    Use Cases:
+    ----------
+    - Finding forgotten or unfiled notes
+    - Suggesting notes that need linking
+    """
+    orphans = vault.graph.orphans
+    return {
+        "results": orphans[: limits.max_results],
+        "truncated": len(orphans) > limits.max_results,
+    }
+
+
+@graph_router.get("/dangling", response_model=DanglingLinksResponse)
+async def graph_dangling_links(
+    vault: ObsidianVault = Depends(get_vault),
+    limits: ResponseLimits = Depends(get_limits),
+):
+    """
+    List links that point at notes which do not exist in the vault.
+
+    Returns:
+    --------
+    {
+        "results": [
+            {
+                "slug": str,    # Note containing the link
+                "target": str   # Link target that could not be resolved
+            }
+        ],
+        "truncated": bool  # True if results were capped by the server
+    }
+
+    Use Cases:
+    ----------
+    - Finding notes that have been referenced but not yet written
+    - Detecting broken links after renames
+    """
+    dangling = vault.graph.dangling
+    return {
+        "results": [
+            {"slug": slug, "target": target}
+            for slug, target in dangling[: limits.max_results]
+        ],
+        "truncated": len(dangling) > limits.max_results,
+    }
+
+
+@graph_router.get("/components", response_model=ConnectedComponentsResponse)
+async def graph_components(
+    limit: int = Query(default=10, ge=1),
+    vault: ObsidianVault = Depends(get_vault),
+    limits: ResponseLimits = Depends(get_limits),
+):
+    """
+    List clusters of notes that are connected to each other by links.
+
+    Link direction is ignored. Clusters are sorted largest first.
+
+    Parameters:
+    -----------
+    limit : int, optional
+        Maximum number of clusters to return, capped by the server. Default: 10
+
+    Returns:
+    --------
+    {
+        "results": [
+            {
+                "size": int,
+                "slugs": [str],
+                "truncated": bool  # True if slugs were capped by the server
+            }
+        ]
+    }
+    """
+    return {
+        "results": [
+            {
+                "size": len(members),
+                "slugs": members[: limits.max_results],
+                "truncated": len(members) > limits.max_results,
+            }
+            for members in vault.graph.components[: min(limit, limits.max_results)]
+        ]
+    }
+
+
+@graph_router.get("/notes/{slug}", response_model=NoteGraphMetrics)
+async def graph_note_metrics(slug: str, vault: ObsidianVault = Depends(get_vault)):
+    """
+    Retrieve the graph metrics of a single note.
+
+    Parameters:
+    -----------
+    slug : str
+        Unique note identifier.
+
+    Returns:
+    --------
+    {
+        "slug": str,
+        "in_degree": int,
+        "out_degree": int,
+        "pagerank": float,
+        "component": int
+    }
+
+    Errors:
+    -------
+    404 Error if note is not found
+    """
+    if slug not in vault.graph.index:
+        raise HTTPException(status_code=404, detail=f"No note found with slug: {slug}")
+    return vault.graph.node_metrics(slug)
+
+
+@graph_router.get("/path", response_model=FindPathResponse)
+async def graph_path(
+    source: str,
+    target: str,
+    max_hops: int = Query(default=6, ge=0),
+    max_nodes: int = Query(default=10000, ge=1),
+    directed: bool = False,
+    vault: ObsidianVault = Depends(get_vault),
+    limits: ResponseLimits = Depends(get_limits),
+):
+    """
+    Explain how two notes are connected through the vault's links.
+
+    Parameters:
+    -----------
+    source : str
+        Slug of the note to start from.
+
+    target : str
+        Slug of the note to reach.
+
+    max_hops : int, optional
+        Longest chain of links to consider. Default: 6
+
+    max_nodes : int, optional
+        Maximum number of notes to visit before giving up, capped by the
+        server. Default: 10000
+
+    directed : bool, optional
+        - False (default): Links may be followed in either direction
+        - True: Only follow links from the note containing them
+
+    Returns:
+    --------
+    {
+        "params": {...},
+        "path": [str] | null,   # Slugs from source to target, inclusive
+        "distance": int | null  # Number of links in the path
+    }
+
+    Example:
+    --------
+    GET /graph/path?source=python-basics&target=neural-networks
+    Response: {
+        "params": {...},
+        "path": ["python-basics", "machine-learning", "neural-networks"],
+        "distance": 2
+    }
+
+    Notes:
+    ------
+    - path is null when no connection exists within the limits
+
+    Errors:
+    -------
+    404 Error if either note is not found
+    """
+    max_nodes = min(max_nodes, limits.max_graph_nodes)
     try:
-        notes = []
-        for slug in request.slugs:
-            note = vault.fetch_note_by_slug(slug)
-            notes.append(note.as_json())
-        return {
-            "params": request,
-            "results": notes,
-        }
+        path = vault.find_path(source, target, max_hops, max_nodes, directed)
     except NoteMissingException as ex:
         raise HTTPException(status_code=404, detail=str(ex))
+
+    return {
+        "params": {
+            "source": source,
+            "target": target,
+            "max_hops": max_hops,
+            "max_nodes": max_nodes,
+            "directed": directed,
+        },
+        "path": path,
+        "distance": None if path is None else len(path) - 1,
+    }
+
+
+@graph_router.get("/neighborhood/{slug}", response_model=NeighborhoodResponse)
+async def graph_neighborhood(
+    slug: str,
+    max_hops: int = Query(default=1, ge=0),
+    max_nodes: int = Query(default=200, ge=1),
+    directed: bool = False,
+    vault: ObsidianVault = Depends(get_vault),
+    limits: ResponseLimits = Depends(get_limits),
+):
+    """
+    Retrieve the subgraph of notes surrounding a note.
+
+    Parameters:
+    -----------
+    slug : str
+        Slug of the note at the centre of the neighborhood.
+
+    max_hops : int, optional
+        How many links away from the note to explore. Default: 1
+
+    max_nodes : int, optional
+        Maximum number of notes to include, capped by the server. Default: 200
+
+    directed : bool, optional
+        - False (default): Include both linked notes and backlinks
+        - True: Only include notes reachable by following links
+
+    Returns:
+    --------
+    {
+        "params": {...},
+        "nodes": [
+            {"slug": str, "distance": int}
+        ],
+        "edges": [[int, int]],  # Links as positions in the nodes list
+        "truncated": bool       # True if max_nodes cut the search short
+    }
+
+    Example:
+    --------
+    GET /graph/neighborhood/machine-learning
+    Response: {
+        "params": {...},
+        "nodes": [
+            {"slug": "machine-learning", "distance": 0},
+            {"slug": "neural-networks", "distance": 1}
+        ],
+        "edges": [[0, 1]],
+        "truncated": false
+    }
+
+    Errors:
+    -------
+    404 Error if note is not found
+    """
+    max_nodes = min(max_nodes, limits.max_results)
+    try:
+        nodes, edges, truncated = vault.find_neighborhood(
+            slug, max_hops, max_nodes, directed
+        )
+    except NoteMissingException as ex:
+        raise HTTPException(status_code=404, detail=str(ex))
+
+    return {
+        "params": {
+            "slug": slug,
+            "max_hops": max_hops,
+            "max_nodes": max_nodes,
+            "directed": directed,
+        },
+        "nodes": [
+            {"slug": node_slug, "distance": distance} for node_slug, distance in nodes
+        ],
+        "edges": edges,
+        "truncated": truncated,
+    }
+
+
+@diagnostics_router.get(
+    "/memory", response_model=MemoryReportResponse, include_in_schema=False
+)
+def memory_usage(vault: ObsidianVault = Depends(get_vault)):
+    """
+    Report the approximate memory held by the vault, in bytes.
+
+    Objects shared between notes, such as interned tags and link targets, are
+    counted once. Walking every object is slow on large vaults, so this is
+    meant for occasional diagnostics rather than monitoring.
+    """
+    return memory_report(vault)
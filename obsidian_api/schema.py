@@ -1,10 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class NoteDetails(BaseModel):
     slug: str
     content: str
     frontmatter: dict
+    truncated: bool = False
 
 
 class FindLinksParams(BaseModel):
@@ -32,25 +33,49 @@ class RelevantNotesItem(BaseModel):
 class FindRelevantNotesResponse(BaseModel):
     params: FindRelevantNotesParams
     results: list[RelevantNotesItem]
+    truncated: bool = False
 
 
 class ListNoteSlugsResponse(BaseModel):
     results: list[str]
+    next_offset: int | None = None
 
 
 class SearchNotesParams(BaseModel):
     query: str
     exact: bool
+    mode: str = "keyword"
+    limit: int = 10
+    snippets: bool = False
+    snippet_chars: int = 160
+
+
+class NoteSnippet(BaseModel):
+    text: str
+    highlights: list[tuple[int, int]]
 
 
 class SearchNotesItem(BaseModel):
     slug: str
     frontmatter: dict
+    score: float | None = None
+    snippet: NoteSnippet | None = None
 
 
 class SearchNotesResponse(BaseModel):
     params: SearchNotesParams
     results: list[SearchNotesItem]
+    truncated: bool = False
+
+
+class FindSimilarNotesParams(BaseModel):
+    slug: str
+    limit: int
+
+
+class FindSimilarNotesResponse(BaseModel):
+    params: FindSimilarNotesParams
+    results: list[SearchNotesItem]
 
 
 class BatchGetNotesRequest(BaseModel):
@@ -60,3 +85,165 @@ class BatchGetNotesRequest(BaseModel):
 class GetBatchNotesResponse(BaseModel):
     params: BatchGetNotesRequest
     results: list[NoteDetails]
+    remaining: list[str] = []
+
+
+class NoteGraphMetrics(BaseModel):
+    slug: str
+    in_degree: int
+    out_degree: int
+    pagerank: float
+    component: int
+
+
+class GraphStatsResponse(BaseModel):
+    notes: int
+    links: int
+    dangling_links: int
+    orphans: int
+    components: int
+
+
+class HubNotesParams(BaseModel):
+    by: str
+    limit: int
+
+
+class HubNotesResponse(BaseModel):
+    params: HubNotesParams
+    results: list[NoteGraphMetrics]
+
+
+class OrphanNotesResponse(BaseModel):
+    results: list[str]
+    truncated: bool = False
+
+
+class DanglingLinkItem(BaseModel):
+    slug: str
+    target: str
+
+
+class DanglingLinksResponse(BaseModel):
+    results: list[DanglingLinkItem]
+    truncated: bool = False
+
+
+class ConnectedComponentItem(BaseModel):
+    size: int
+    slugs: list[str]
+    truncated: bool = False
+
+
+class ConnectedComponentsResponse(BaseModel):
+    results: list[ConnectedComponentItem]
+
+
+class FindPathParams(BaseModel):
+    source: str
+    target: str
+    max_hops: int
+    max_nodes: int
+    directed: bool
+
+
+class FindPathResponse(BaseModel):
+    params: FindPathParams
+    path: list[str] | None
+    distance: int | None
+
+
+class NeighborhoodParams(BaseModel):
+    slug: str
+    max_hops: int
+    max_nodes: int
+    directed: bool
+
+
+class NeighborhoodNode(BaseModel):
+    slug: str
+    distance: int
+
+
+class NeighborhoodResponse(BaseModel):
+    params: NeighborhoodParams
+    nodes: list[NeighborhoodNode]
+    edges: list[tuple[int, int]]
+    truncated: bool
+
+
+class NoteOutlineParams(BaseModel):
+    slug: str
+
+
+class NoteOutlineSection(BaseModel):
+    level: int
+    title: str
+    start_byte: int
+    end_byte: int
+    line: int
+
+
+class NoteOutlineResponse(BaseModel):
+    params: NoteOutlineParams
+    sections: list[NoteOutlineSection]
+
+
+class NoteSectionRequest(BaseModel):
+    slug: str
+    heading: str | None = None
+    start_line: int | None = Field(default=None, ge=1)
+    end_line: int | None = Field(default=None, ge=1)
+    start_byte: int | None = Field(default=None, ge=0)
+    end_byte: int | None = Field(default=None, ge=0)
+
+
+class ReadNoteSectionsRequest(BaseModel):
+    sections: list[NoteSectionRequest]
+    max_chars: int | None = Field(default=None, ge=0)
+
+
+class NoteSectionItem(BaseModel):
+    slug: str
+    heading: str | None = None
+    start_byte: int | None = None
+    end_byte: int | None = None
+    content: str
+    truncated: bool
+
+
+class ReadNoteSectionsResponse(BaseModel):
+    params: ReadNoteSectionsRequest
+    results: list[NoteSectionItem]
+
+
+class MemoryReportResponse(BaseModel):
+    notes: int
+    note_bytes: int
+    bytes_per_note: int
+    fields: dict[str, int]
+    search_index_bytes: int
+
+
+class ChangeEvent(BaseModel):
+    sequence: int
+    type: str
+    slug: str
+    timestamp: float
+
+
+class NoteChangesParams(BaseModel):
+    since: int
+    epoch: str | None = None
+    limit: int | None
+    wait: float
+
+
+class NoteChangesResponse(BaseModel):
+    params: NoteChangesParams
+    epoch: str
+    sequence: int
+    events: list[ChangeEvent]
+    reset: bool
+    truncated: bool = False
+    next_since: int | None = None
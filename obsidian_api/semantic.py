@@ -0,0 +1,131 @@
+import zlib
+from array import array
+
+import numpy as np
+
+from obsidian_api.tokenizer import default_analyzer
+
+
+class HashingEmbedder:
+    """
+    Embeds text as a fixed-size vector using the hashing trick.
+
+    Each analyzed term is hashed to one of `dimensions` buckets with a
+    pseudo-random sign, weighted by its sublinear term frequency. Hashes are
+    stable across processes, so vectors can be computed ahead of time.
+
+    Any callable with a `dimensions` attribute that maps text to a sequence of
+    that many floats can be used in its place, such as a local embedding model.
+    """
+
+    def __init__(self, analyzer=default_analyzer, dimensions=256):
+        self.analyzer = analyzer
+        self.dimensions = dimensions
+
+    def __call__(self, text):
+        counts = self.analyzer.counts(text)
+        digests = np.fromiter(
+            map(zlib.crc32, map(str.encode, counts)), dtype=np.uint32, count=len(counts)
+        )
+        weights = 1.0 + np.log(
+            np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        )
+        weights[(digests & 1) == 0] *= -1.0
+        buckets = (digests >> 1) % self.dimensions
+        return np.bincount(buckets, weights=weights, minlength=self.dimensions).tolist()
+
+
+class SemanticIndex:
+    """
+    Unit-length note embeddings stored row by row in one contiguous float32
+    array, so a query is scored against every note with a single
+    matrix-vector product.
+    """
+
+    def __init__(self, embedder):
+        self.embedder = embedder
+        self.dimensions = embedder.dimensions
+        self.matrix = array("f")
+        self.slugs = []
+        self.rows = {}
+        self._sources = {}
+
+    def sync(self, notes, vectors=None):
+        """
+        Re-embed only the notes that were added, replaced or removed, using
+        the embeddings in `vectors`, by slug, where they were made ahead of time.
+        """
+        vectors = vectors or {}
+        for slug in [slug for slug in self.rows if slug not in notes]:
+            self.remove(slug)
+        for slug, note in notes.items():
+            if self._sources.get(slug) is not note:
+                vector = vectors.get(slug)
+                if vector is None:
+                    vector = self.embed(note.content)
+                self.store(slug, vector)
+                self._sources[slug] = note
+
+    def embed(self, text):
+        """The unit-length embedding of `text`, as stored by `store`."""
+        return self._normalize(self.embedder(text))
+
+    def update(self, slug, text):
+        self.store(slug, self.embed(text))
+
+    def store(self, slug, vector):
+        if slug in self.rows:
+            start = self.rows[slug] * self.dimensions
+            self.matrix[start : start + self.dimensions] = array("f", vector.tobytes())
+        else:
+            self.rows[slug] = len(self.slugs)
+            self.slugs.append(slug)
+            self.matrix.frombytes(vector.tobytes())
+
+    def remove(self, slug):
+        """Drop a note by moving the last row into its place."""
+        row = self.rows.pop(slug)
+        self._sources.pop(slug, None)
+        last = len(self.slugs) - 1
+        if row != last:
+            moved = self.slugs[last]
+            self.matrix[row * self.dimensions : (row + 1) * self.dimensions] = (
+                self.matrix[last * self.dimensions :]
+            )
+            self.slugs[row] = moved
+            self.rows[moved] = row
+        self.slugs.pop()
+        del self.matrix[last * self.dimensions :]
+
+    def search(self, text, limit=10):
+        """Return up to `limit` `(slug, score)` pairs, most similar first."""
+        return self._top(self.embed(text), limit)
+
+    def similar(self, slug, limit=10):
+        start = self.rows[slug] * self.dimensions
+        vector = self.matrix[start : start + self.dimensions]
+        return self._top(vector, limit, exclude=slug)
+
+    def _top(self, vector, limit, exclude=None):
+        if limit <= 0 or not self.slugs or not any(vector):
+            return []
+
+        matrix = np.frombuffer(self.matrix, dtype=np.float32)
+        scores = matrix.reshape(-1, self.dimensions) @ np.asarray(
+            vector, dtype=np.float32
+        )
+        del matrix
+        if exclude is not None:
+            scores[self.rows[exclude]] = 0.0
+        count = min(limit, len(scores))
+        best = np.argpartition(-scores, count - 1)[:count]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [
+            (self.slugs[row], float(scores[row])) for row in best if scores[row] > 0
+        ]
+
+    @staticmethod
+    def _normalize(vector):
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
@@ -0,0 +1,66 @@
+from collections import Counter
+
+from obsidian_api.tokenizer import WORD_PATTERN
+
+
+def make_snippet(content, hits, max_chars=160):
+    """
+    Cut a window of `content` around its best-matching region.
+
+    `hits` are `(offset, term)` pairs for the query terms found in the note,
+    as stored in the search index. The window is placed over the stretch that
+    contains the most distinct terms, so the note never has to be rescanned.
+    Returns the snippet text and the `(start, end)` positions of the matched
+    words within it.
+    """
+    if not hits:
+        return {"text": content[:max_chars], "highlights": []}
+
+    hits = sorted(hits)
+    first, last = _best_window(hits, max_chars)
+    match_start = hits[first][0]
+    match_end = _word_end(content, hits[last][0])
+
+    start = max(0, match_start - (max_chars - (match_end - match_start)) // 2)
+    end = min(len(content), start + max_chars)
+    start = max(0, end - max_chars)
+
+    # Avoid cutting words in half at either edge of the window.
+    if start > 0:
+        space = content.find(" ", start, match_start)
+        if space != -1:
+            start = space + 1
+    if end < len(content):
+        space = content.rfind(" ", match_end, end)
+        if space != -1:
+            end = space
+
+    highlights = []
+    for offset, _ in hits:
+        word_end = _word_end(content, offset)
+        if start <= offset and word_end <= end:
+            highlights.append((offset - start, word_end - start))
+
+    return {"text": content[start:end], "highlights": highlights}
+
+
+def _best_window(hits, width):
+    """Indexes of the first and last hit of the span with most distinct terms."""
+    best = (0, 0, 0)
+    terms = Counter()
+    left = 0
+    for right, (offset, term) in enumerate(hits):
+        terms[term] += 1
+        while offset - hits[left][0] > width:
+            terms[hits[left][1]] -= 1
+            if not terms[hits[left][1]]:
+                del terms[hits[left][1]]
+            left += 1
+        if len(terms) > best[0]:
+            best = (len(terms), left, right)
+    return best[1], best[2]
+
+
+def _word_end(content, offset):
+    match = WORD_PATTERN.match(content, offset)
+    return match.end() if match else offset
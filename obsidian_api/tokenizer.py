@@ -0,0 +1,171 @@
+import re
+import unicodedata
+from collections import Counter
+from itertools import compress
+
+WORD_PATTERN = re.compile(r"\w+")
+
+# Regions of markdown that carry no prose worth indexing: fenced code blocks,
+# inline code, markdown link targets and bare URLs. The leading lookahead lets
+# the regex engine skip past ordinary characters without trying each branch.
+MARKDOWN_NOISE_PATTERN = re.compile(
+    r"(?=[`~\]<hf])"
+    r"(?:^```.*?(?:^```|\Z)"
+    r"|^~~~.*?(?:^~~~|\Z)"
+    r"|`[^`\n]*`"
+    r"|\]\([^)\n]*\)"
+    r"|<?\b(?:https?|ftp)://[^\s>)\]]+>?)",
+    re.DOTALL | re.MULTILINE,
+)
+
+# Cheap substring checks for whether a text can contain markdown noise at all.
+MARKDOWN_NOISE_MARKERS = ("`", "~~~", "](", "://")
+
+# Words outside markdown noise. Noise matches with an empty group, so a single
+# `findall` or `finditer` pass over the text both skips it and finds the words.
+TOKEN_PATTERN = re.compile(
+    rf"{MARKDOWN_NOISE_PATTERN.pattern}|(\w+)", MARKDOWN_NOISE_PATTERN.flags
+)
+
+STOPWORDS = frozenset(
+    """
+    a an and are as at be but by for from has have he her his i if in into is
+    it its me my no not of on or our she so that the their them then there
+    these they this to was we were what when where which who will with you
+    your d ll re s t ve
+    """.split()
+)
+
+
+def normalize_unicode(term):
+    return unicodedata.normalize("NFKC", term)
+
+
+def lowercase(term):
+    return term.casefold()
+
+
+def remove_stopwords(term):
+    return None if term in STOPWORDS else term
+
+
+def stem(term):
+    """A light suffix-stripping stemmer, good enough to fold plurals and tenses."""
+    for suffix in ("ingly", "edly", "ing", "ies", "ed", "ly", "s"):
+        if term.endswith(suffix) and len(term) - len(suffix) >= 3:
+            if suffix == "ies":
+                return term[:-3] + "y"
+            if suffix == "s" and term.endswith(("ss", "us")):
+                return term
+            return term[: -len(suffix)]
+    return term
+
+
+DEFAULT_STAGES = (normalize_unicode, lowercase, remove_stopwords)
+
+
+# Maps stopwords to None and leaves other terms alone: `STOP_MAP.get(t, t)`.
+STOP_MAP = dict.fromkeys(STOPWORDS)
+
+
+class Analyzer:
+    """
+    Turns text into index terms.
+
+    Words are found in one regex pass over the text, without copying it, and
+    mapped to terms with C-level `map` calls. `stages` other than the defaults
+    are applied once per distinct word rather than once per occurrence. A
+    stage takes a term and returns the transformed term, or None to drop it.
+
+    The default stages are applied inline: ASCII text only needs `str.lower`,
+    which is all NFKC and casefolding would do to it.
+    """
+
+    def __init__(self, stages=DEFAULT_STAGES, skip_markdown=True):
+        self.stages = tuple(stages)
+        self.skip_markdown = skip_markdown
+        inline = self.stages[: len(DEFAULT_STAGES)] == DEFAULT_STAGES
+        self._inline = inline
+        self._extra_stages = self.stages[len(DEFAULT_STAGES) :] if inline else ()
+
+    def tokens(self, text):
+        """Iterate `(term, offset)` pairs, where offset is the word's start in `text`."""
+        return zip(*self.columns(text))
+
+    def columns(self, text):
+        """The terms in `text` and the offsets of their words, as two lists."""
+        pattern = self._pattern(text)
+        terms = self._terms_of(pattern.findall(text), text.isascii())
+        # Noise matches and dropped words have no term and are filtered out.
+        offsets = compress(map(re.Match.start, pattern.finditer(text)), terms)
+        return list(filter(None, terms)), list(offsets)
+
+    def terms(self, text):
+        """The set of distinct terms in `text`."""
+        words = self._pattern(text).findall(text)
+        if self._inline and not self._extra_stages:
+            if text.isascii():
+                terms = set(map(str.lower, words))
+            else:
+                terms = set(self._normalize(words, False))
+            terms.discard("")
+            return terms - STOPWORDS
+
+        terms = set(self._terms_of(words, text.isascii()))
+        terms.discard(None)
+        terms.discard("")
+        return terms
+
+    def counts(self, text):
+        """How often each term occurs in `text`."""
+        counts = Counter(
+            self._terms_of(self._pattern(text).findall(text), text.isascii())
+        )
+        counts.pop(None, None)
+        counts.pop("", None)
+        return counts
+
+    def _pattern(self, text):
+        if self.skip_markdown and any(
+            marker in text for marker in MARKDOWN_NOISE_MARKERS
+        ):
+            return TOKEN_PATTERN
+        return WORD_PATTERN
+
+    def _terms_of(self, words, ascii):
+        """The term for each of `words`, or a falsy value for dropped words."""
+        if not self._inline:
+            mapping = {word: self._apply(word, self.stages) for word in set(words)}
+            return list(map(mapping.__getitem__, words))
+
+        terms = self._normalize(words, ascii)
+        if not self._extra_stages:
+            return list(map(STOP_MAP.get, terms, terms))
+
+        # Stopwords are matched before any extra stage, such as stemming.
+        mapping = {
+            term: None if term in STOPWORDS else self._apply(term, self._extra_stages)
+            for term in set(terms)
+        }
+        return list(map(mapping.__getitem__, terms))
+
+    @staticmethod
+    def _normalize(words, ascii):
+        """NFKC and casefold each of `words`, normalizing distinct words once."""
+        if ascii:
+            return list(map(str.lower, words))
+        mapping = {
+            word: unicodedata.normalize("NFKC", word).casefold() for word in set(words)
+        }
+        return list(map(mapping.__getitem__, words))
+
+    @staticmethod
+    def _apply(term, stages):
+        for stage in stages:
+            term = stage(term)
+            if not term:
+                return None
+        return term
+
+
+default_analyzer = Analyzer()
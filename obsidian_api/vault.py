@@ -1,84 +1,211 @@
 import logging
 import os
-import re
-from collections import defaultdict, deque
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict, namedtuple
 from difflib import get_close_matches
+from itertools import repeat
 
-from obsidian_api.exceptions import DuplicateSlugDetected, NoteMissingException
-from obsidian_api.note import Note
+from obsidian_api.changes import ChangeJournal
+from obsidian_api.exceptions import (
+    DuplicateSlugDetected,
+    IndexNotReadyException,
+    NoteMissingException,
+    SectionMissingException,
+)
+from obsidian_api.graph import LinkGraph
+from obsidian_api.note import Note, parse_outline
+from obsidian_api.semantic import HashingEmbedder, SemanticIndex
+from obsidian_api.snippets import make_snippet
+from obsidian_api.tokenizer import default_analyzer
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# A changed note read and analyzed off the event loop, ready for apply_changes.
+PreparedNote = namedtuple("PreparedNote", "note stat words positions vector")
+
 
 class ObsidianVault:
-    def __init__(self, directory):
+    def __init__(self, directory, analyzer=default_analyzer, embedder=None):
         self.directory = directory
+        self.analyzer = analyzer
+        self.embedder = embedder or HashingEmbedder(analyzer)
         self.notes = {}
+        self.file_stats = {}
+        # Files that failed to load, so they are only retried once they change.
+        self.failed_files = {}
+        self.changes = ChangeJournal()
+        self._semantic_index = None
         self.load_notes()
         self.build_index()
 
+    @property
+    def graph(self):
+        """The link graph, computed on first use after the index is (re)built."""
+        if self._graph is None:
+            self._graph = LinkGraph.from_vault(self)
+        return self._graph
+
+    @property
+    def semantic_index(self):
+        """Note embeddings, kept in sync by build_index once they are built."""
+        if self._semantic_index is None:
+            raise IndexNotReadyException("The semantic index is still being built")
+        return self._semantic_index
+
+    def build_semantic_index(self):
+        """
+        Embed every note. This is the slowest part of loading a large vault,
+        so it is done after the vault starts serving other requests.
+        """
+        index = SemanticIndex(self.embedder)
+        index.sync(self.notes)
+        self._semantic_index = index
+        return index
+
+    def warm_up(self):
+        """
+        Build the link graph ahead of the first request that needs it, so that
+        request does not block the event loop.
+        """
+        return self.graph
+
     def list_note_slugs(self):
         return list(self.notes.keys())
 
     def find_relevant_notes(self, slug, max_hops=2, char_limit=100):
-        queue = deque([(slug, 0)])
-        visited = set()
-        relevant_notes = []
-
-        while queue:
-            current_slug, current_hop = queue.popleft()
+        self.fetch_note_by_slug(slug)
+        nodes, _, _ = self.graph.neighborhood(
+            slug, max_hops=max_hops, max_nodes=len(self.notes), directed=True
+        )
 
-            if current_slug in visited:
-                continue
+        relevant_notes = []
+        for current_slug, distance in nodes[1:]:
+            current_note = self.notes[current_slug]
+            relevant_notes.append(
+                {
+                    "slug": current_note.slug,
+                    "content_summary": current_note.content[:char_limit],
+                    "frontmatter": current_note.frontmatter,
+                    "distance": distance,
+                }
+            )
+        return relevant_notes
 
-            visited.add(current_slug)
+    def find_path(self, source, target, max_hops=6, max_nodes=10000, directed=False):
+        self.fetch_note_by_slug(source)
+        self.fetch_note_by_slug(target)
+        return self.graph.shortest_path(source, target, max_hops, max_nodes, directed)
 
-            if current_hop <= max_hops:
-                current_note = self.fetch_note_by_slug(current_slug)
+    def find_neighborhood(self, slug, max_hops=1, max_nodes=200, directed=False):
+        self.fetch_note_by_slug(slug)
+        return self.graph.neighborhood(slug, max_hops, max_nodes, directed)
 
-                if current_hop > 0:
-                    relevant_notes.append(
-                        {
-                            "slug": current_note.slug,
-                            "content_summary": current_note.content[:char_limit],
-                            "frontmatter": current_note.frontmatter,
-                            "distance": current_hop,
-                        }
-                    )
+    def search_notes(self, query: str, snippet_chars=None, max_results=None):
+        terms = self.analyzer.terms(query)
+        if not terms:
+            return []
 
-                for link in current_note.extract_links():
-                    if link in self.notes:
-                        queue.append((link, current_hop + 1))
+        postings = [self.index.get(term, ()) for term in terms]
+        common = set.intersection(*(set(slugs) for slugs in postings))
+        slugs = [slug for slug in postings[0] if slug in common][:max_results]
 
-        return relevant_notes
-
-    def search_notes(self, query: str):
-        return [
+        results = [
             {
                 "slug": current_note.slug,
                 "frontmatter": current_note.frontmatter,
             }
-            for current_note in self._notes_from_slugs(self.index.get(query, []))
+            for current_note in self._notes_from_slugs(slugs)
         ]
+        return self._with_snippets(results, terms, snippet_chars)
 
-    def fuzzy_search_notes(self, query: str):
-        slugs = set()
-        for word in get_close_matches(query, self.index.keys()):
-            for slug in self.index[word]:
-                slugs.add(slug)
+    def fuzzy_search_notes(self, query: str, snippet_chars=None, max_results=None):
+        words = set()
+        # slug -> how many of the query's terms it matches
+        matches = Counter()
+        for term in self.analyzer.terms(query):
+            slugs = set()
+            for word in get_close_matches(term, self.index.keys()):
+                words.add(word)
+                slugs.update(self.index[word])
+            matches.update(slugs)
 
-        return [
+        # Best matches first, then by slug, so the cut is the same every time.
+        ranked = sorted(matches, key=lambda slug: (-matches[slug], slug))
+        results = [
             {
                 "slug": current_note.slug,
                 "frontmatter": current_note.frontmatter,
             }
-            for current_note in self._notes_from_slugs(list(slugs))
+            for current_note in self._notes_from_slugs(ranked[:max_results])
         ]
+        return self._with_snippets(results, words, snippet_chars)
+
+    def semantic_search_notes(self, query: str, limit=10, snippet_chars=None):
+        results = self._scored_results(self.semantic_index.search(query, limit))
+        return self._with_snippets(results, self.analyzer.terms(query), snippet_chars)
+
+    def find_similar_notes(self, slug, limit=10):
+        self.fetch_note_by_slug(slug)
+        return self._scored_results(self.semantic_index.similar(slug, limit))
+
+    def read_note_section(
+        self,
+        slug,
+        heading=None,
+        start_line=None,
+        end_line=None,
+        start_byte=None,
+        end_byte=None,
+        max_chars=None,
+    ):
+        """
+        Read part of a note from disk: a section by heading, a range of lines
+        or a range of bytes. Reads the note's content from memory when no part
+        is given. Raises NoteChangedException if the file changed after it
+        was loaded, until the next refresh picks up the new version.
+        """
+        note = self.fetch_note_by_slug(slug)
+
+        if heading is not None:
+            section = note.find_section(heading)
+            if section is None:
+                raise SectionMissingException(
+                    f"No section with heading: {heading} in note: {slug}"
+                )
+            start, end = section.start, section.end
+        elif start_line is not None or end_line is not None:
+            start, end = note.line_range(start_line or 1, end_line)
+        elif start_byte is not None or end_byte is not None:
+            start, end = start_byte or 0, end_byte
+            if end is None:
+                end = os.path.getsize(note.filepath)
+        else:
+            content = note.content
+            if max_chars is not None and len(content) > max_chars:
+                return {"content": content[:max_chars], "truncated": True}
+            return {"content": content, "truncated": False}
+
+        content, truncated = note.read_range(
+            start, end, max_chars, stat=self.file_stats.get(note.filepath)
+        )
+        return {
+            "content": content,
+            "truncated": truncated,
+            "start_byte": start,
+            "end_byte": end,
+        }
 
     def find_ancestors(self, slug, max_hops=2, char_limit=100):
         raise NotImplementedError("find_ancestors method is not implemented yet.")
 
+    def resolve_link(self, link):
+        """Map a normalized link target to a slug in the vault, ignoring case."""
+        if link in self.notes:
+            return link
+        return self.slug_lookup.get(link.casefold())
+
     def fetch_note_by_slug(self, slug):
         if slug not in self.notes:
             raise NoteMissingException(f"No note found with slug: {slug}")
@@ -91,28 +218,285 @@ class ObsidianVault:
                     self._load_note_file(os.path.join(root, filename))
 
     def build_index(self):
+        self.slug_lookup = {slug.casefold(): slug for slug in self.notes}
+        self._graph = None
+        if self._semantic_index is not None:
+            self._semantic_index.sync(self.notes)
+        # term -> slugs of the notes that contain it
         self.index = defaultdict(list)
-        for slug, note in self.notes.items():
-            words = set(re.findall(r"\w+", note.content.lower()))
-            for word in words:
-                self.index[word].append(slug)
+        # Word positions for snippets, stored compactly: each term gets a small
+        # id, and each note one array of its offsets sorted by term id.
+        self.term_ids = {}
+        self.terms = []
+        self.positions = {}
+        for note in self.notes.values():
+            self._index_note(note)
 
         # logger.info(f"Index built successfully! {len(self.index)} total words indexed.")
 
+    def scan_changes(self):
+        """
+        Compare the note files on disk with the loaded notes.
+
+        Returns the paths of created or modified files and of deleted files.
+        Only reads the vault, so it can run off the event loop.
+        """
+        found = {}
+        for root, _, files in os.walk(self.directory):
+            for filename in files:
+                if filename.endswith(".md"):
+                    filepath = os.path.join(root, filename)
+                    try:
+                        stat = os.stat(filepath)
+                    except FileNotFoundError:
+                        continue
+                    found[filepath] = (stat.st_mtime_ns, stat.st_size)
+
+        changed = [
+            path
+            for path, stat in found.items()
+            if stat != self.file_stats.get(path) and stat != self.failed_files.get(path)
+        ]
+        deleted = [path for path in self.file_stats if path not in found]
+        for path in [path for path in self.failed_files if path not in found]:
+            del self.failed_files[path]
+        return changed, deleted
+
+    def prepare_changes(self, changed, deleted=()):
+        """
+        Read, parse and analyze the changed files, so that apply_changes only
+        has to swap the results in. Only adds to the vault's term ids, which
+        requests never see until a note uses them, so it can run off the
+        event loop.
+
+        A file that cannot be read or parsed, or whose slug is already used by
+        another file that is not being deleted, is logged and left out until
+        it changes again.
+        """
+        prepared = []
+        deleted = set(deleted)
+        claimed = {}
+        for filepath in changed:
+            slug = self._slug_for(filepath)
+            previous = self.notes.get(slug)
+            owner = filepath
+            if previous is not None and previous.filepath not in deleted:
+                owner = previous.filepath
+            owner = claimed.get(slug, owner)
+            if owner != filepath:
+                logger.warning(
+                    f"Skipping {filepath}: slug {slug} is already used by {owner}"
+                )
+                self._record_failure(filepath)
+                continue
+
+            try:
+                note, stat = self._parse_note_file(slug, filepath)
+            except FileNotFoundError:
+                continue  # Deleted since the scan; the next scan will notice
+            except Exception:
+                logger.exception(f"Skipping {filepath}: failed to load the note")
+                continue
+
+            claimed[slug] = filepath
+            words, positions = self._analyze_note(note)
+            vector = None
+            if self._semantic_index is not None:
+                vector = self._semantic_index.embed(note.content)
+            prepared.append(PreparedNote(note, stat, words, positions, vector))
+        return prepared
+
+    def apply_changes(self, prepared, deleted):
+        """
+        Swap the prepared notes into the vault, drop the deleted ones, and
+        record the changes.
+        """
+        events = []
+        vectors = {}
+        # term -> slugs to take out of its postings, in one pass per term
+        gone = defaultdict(set)
+        try:
+            for filepath in deleted:
+                del self.file_stats[filepath]
+                slug = self._slug_for(filepath)
+                note = self.notes.get(slug)
+                if note is not None and note.filepath == filepath:
+                    del self.notes[slug]
+                    for word in self._terms_at(self.positions.pop(slug)):
+                        gone[word].add(slug)
+                    if self.slug_lookup.get(slug.casefold()) == slug:
+                        del self.slug_lookup[slug.casefold()]
+                    events.append(("deleted", slug))
+                    # Files skipped because they had this slug can load now.
+                    for path in [
+                        path
+                        for path in self.failed_files
+                        if self._slug_for(path) == slug
+                    ]:
+                        del self.failed_files[path]
+            # A deleted slug may come back below, under a new path.
+            self._remove_postings(gone)
+            gone.clear()
+
+            for note, stat, words, positions, vector in prepared:
+                slug = note.slug
+                previous = self.notes.get(slug)
+                if previous is None:
+                    old = set()
+                else:
+                    # Only the postings of terms the edit added or dropped change.
+                    old = self._terms_at(self.positions[slug])
+                    for word in old.difference(words):
+                        gone[word].add(slug)
+                for word in words:
+                    if word not in old:
+                        self.index[word].append(slug)
+                self.positions[slug] = positions
+                self.notes[slug] = note
+                self.slug_lookup.setdefault(slug.casefold(), slug)
+                self.failed_files.pop(note.filepath, None)
+                self.file_stats[note.filepath] = stat
+                if vector is not None:
+                    vectors[slug] = vector
+                events.append(("created" if previous is None else "modified", slug))
+        finally:
+            self._remove_postings(gone)
+            if events:
+                self._graph = None
+                if self._semantic_index is not None:
+                    self._semantic_index.sync(self.notes, vectors)
+                for kind, slug in events:
+                    self.changes.record(kind, slug)
+        return events
+
+    def refresh(self):
+        changed, deleted = self.scan_changes()
+        return self.apply_changes(self.prepare_changes(changed, deleted), deleted)
+
+    def _index_note(self, note):
+        self._add_postings(note.slug, *self._analyze_note(note))
+
+    def _analyze_note(self, note):
+        """
+        Return the note's distinct terms and its positions: the term id of
+        every word, in ascending order, followed by the words' offsets in the
+        same order, so the offsets of one term are a contiguous slice.
+        """
+        term_ids = self.term_ids
+        words, offsets = self.analyzer.columns(note.content)
+        distinct = list(dict.fromkeys(words))
+        for word in distinct:
+            if word not in term_ids:
+                term_ids[word] = len(self.terms)
+                self.terms.append(word)
+
+        ids = list(map(term_ids.__getitem__, words))
+        order = sorted(range(len(ids)), key=ids.__getitem__)
+        positions = array(
+            "I", [*map(ids.__getitem__, order), *map(offsets.__getitem__, order)]
+        )
+        return distinct, positions
+
+    def _add_postings(self, slug, words, positions):
+        for word in words:
+            self.index[word].append(slug)
+        self.positions[slug] = positions
+
+    def _terms_at(self, positions):
+        """The distinct terms of a note, from its positions."""
+        return set(map(self.terms.__getitem__, positions[: len(positions) // 2]))
+
+    def _remove_postings(self, gone):
+        for word, slugs in gone.items():
+            postings = self.index[word]
+            if len(slugs) == 1:
+                postings.remove(next(iter(slugs)))
+            else:
+                postings[:] = [slug for slug in postings if slug not in slugs]
+            if not postings:
+                del self.index[word]
+
+    def _hits(self, slug, terms):
+        """`(offset, term)` pairs for every occurrence of `terms` in a note."""
+        positions = self.positions.get(slug, ())
+        half = len(positions) // 2
+        hits = []
+        for term in terms:
+            term_id = self.term_ids.get(term)
+            if term_id is None:
+                continue
+            start = bisect_left(positions, term_id, 0, half)
+            end = bisect_right(positions, term_id, start, half)
+            hits.extend(zip(positions[half + start : half + end], repeat(term)))
+        hits.sort()
+        return hits
+
     def _notes_from_slugs(self, slugs: list[str]):
         for current_slug in slugs:
             yield self.fetch_note_by_slug(current_slug)
 
+    def _with_snippets(self, results, terms, snippet_chars):
+        if snippet_chars is None:
+            return results
+
+        for result in results:
+            result["snippet"] = make_snippet(
+                self.notes[result["slug"]].content,
+                self._hits(result["slug"], terms),
+                snippet_chars,
+            )
+        return results
+
+    def _scored_results(self, matches):
+        return [
+            {
+                "slug": current_slug,
+                "frontmatter": self.notes[current_slug].frontmatter,
+                "score": score,
+            }
+            for current_slug, score in matches
+        ]
+
+    def _slug_for(self, filepath):
+        return os.path.basename(filepath)[:-3]  # Remove the '.md' extension for slug
+
     def _load_note_file(self, filepath):
-        slug = os.path.basename(filepath)[:-3]  # Remove the '.md' extension for slug
+        slug = self._slug_for(filepath)
         if slug in self.notes:
             # TODO: unit test this logic
             raise DuplicateSlugDetected(slug)
 
-        with open(filepath, "r") as file:
-            text = file.read()
+        self.notes[slug] = self._read_note_file(slug, filepath)
+
+    def _read_note_file(self, slug, filepath):
+        note, stat = self._parse_note_file(slug, filepath)
+        self.failed_files.pop(filepath, None)
+        self.file_stats[filepath] = stat
+        return note
+
+    def _parse_note_file(self, slug, filepath):
+        """Return the note and the `(mtime_ns, size)` of the file it was read from."""
+        with open(filepath, "rb") as file:
+            stat = os.fstat(file.fileno())
+            data = file.read()
             # logger.info(f"Loaded note: {slug} from {filepath}")
-            self.notes[slug] = Note(slug=slug, filename=filepath, text=text)
+
+        try:
+            text = data.decode("utf-8").replace("\r\n", "\n")
+            note = Note(
+                slug=slug, filename=filepath, text=text, outline=parse_outline(data)
+            )
+        except Exception:
+            self.failed_files[filepath] = (stat.st_mtime_ns, stat.st_size)
+            raise
+        return note, (stat.st_mtime_ns, stat.st_size)
+
+    def _record_failure(self, filepath):
+        try:
+            stat = os.stat(filepath)
+        except FileNotFoundError:
+            return
+        self.failed_files[filepath] = (stat.st_mtime_ns, stat.st_size)
 
     def watch_changes(self):
         """A mock implementation that simulates change detection."""
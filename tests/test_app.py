@@ -2,6 +2,8 @@ import pytest
 from fastapi.testclient import TestClient
 
 from obsidian_api.api import app
+from obsidian_api.limits import ResponseLimits
+from obsidian_api.routes import get_limits, vault_loader
 
 client = TestClient(app)
 
@@ -27,5 +29,342 @@ def test_read_note_not_found():
     assert response.json() == {"detail": "Note not found"}
 
 
+def test_semantic_search():
+    vault_loader.get().build_semantic_index()
+    response = client.get(
+        "/notes/search", params={"q": "another note", "mode": "semantic"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["results"][0]["slug"] == "note2"
+
+
+def test_semantic_search_before_index_is_built(monkeypatch):
+    monkeypatch.setattr(vault_loader.get(), "_semantic_index", None)
+
+    search = client.get("/notes/search", params={"q": "note", "mode": "semantic"})
+    similar = client.get("/notes/note1/similar")
+
+    assert search.status_code == 503
+    assert similar.status_code == 503
+
+
+def test_search_with_snippets():
+    response = client.get(
+        "/notes/search",
+        params={"q": "another", "exact": True, "snippets": True, "snippet_chars": 30},
+    )
+
+    assert response.status_code == 200
+    snippet = response.json()["results"][0]["snippet"]
+    assert snippet == {"text": "This is another sample note", "highlights": [[8, 15]]}
+
+
+def test_similar_notes_not_found():
+    response = client.get("/notes/non_existent_note/similar")
+
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_similar_notes_rejects_invalid_limit(limit):
+    response = client.get("/notes/note1/similar", params={"limit": limit})
+
+    assert response.status_code == 422
+
+
+def test_similar_notes_are_capped():
+    vault_loader.get().build_semantic_index()
+    app.dependency_overrides[get_limits] = lambda: ResponseLimits(max_results=1)
+    try:
+        response = client.get("/notes/note1/similar", params={"limit": 10**9})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert [note["slug"] for note in response.json()["results"]] == ["note3"]
+
+
+def test_note_outline():
+    response = client.get("/notes/note2/outline")
+
+    assert response.status_code == 200
+    assert response.json()["sections"] == [
+        {"level": 0, "title": "", "start_byte": 43, "end_byte": 139, "line": 5}
+    ]
+
+
+def test_read_note_sections_with_budget():
+    response = client.post(
+        "/notes/sections",
+        json={
+            "sections": [{"slug": "note1"}, {"slug": "note2", "start_line": 6}],
+            "max_chars": 50,
+        },
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results[0]["content"] == "This is a sample note for testing purposes."
+    assert results[0]["truncated"] is False
+    assert results[1]["content"] == "This is"
+    assert results[1]["truncated"] is True
+
+
+def test_read_note_sections_missing_heading():
+    response = client.post(
+        "/notes/sections",
+        json={"sections": [{"slug": "note1", "heading": "Nowhere"}]},
+    )
+
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"sections": [{"slug": "note1", "start_byte": -3}]},
+        {"sections": [{"slug": "note1", "end_byte": -1}]},
+        {"sections": [{"slug": "note1", "start_line": 0}]},
+        {"sections": [{"slug": "note1", "start_byte": 0}], "max_chars": -1},
+    ],
+)
+def test_read_note_sections_rejects_negative_ranges(body):
+    response = client.post("/notes/sections", json=body)
+
+    assert response.status_code == 422
+
+
+def test_healthz():
+    response = client.get("/healthz")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+
+def test_readyz_once_vault_is_loaded():
+    client.get("/notes/")
+    response = client.get("/readyz")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+    assert response.json()["generation"] >= 1
+
+
+def test_memory_diagnostics():
+    response = client.get("/diagnostics/memory")
+
+    assert response.status_code == 200
+    assert response.json()["notes"] == 4
+
+
+def test_note_changes():
+    response = client.get("/notes/changes", params={"since": 0, "wait": 0.01})
+
+    assert response.status_code == 200
+    assert response.json()["events"] == []
+    assert response.json()["reset"] is False
+
+
+def test_note_changes_reset():
+    response = client.get("/notes/changes", params={"since": 1000})
+
+    assert response.json()["reset"] is True
+
+
+def test_note_changes_truncated():
+    changes = vault_loader.get().changes
+    since = changes.sequence
+    for slug in ["note1", "note2", "note3"]:
+        changes.record("modified", slug)
+
+    first = client.get("/notes/changes", params={"since": since, "limit": 2}).json()
+    rest = client.get(
+        "/notes/changes", params={"since": first["next_since"], "limit": 2}
+    ).json()
+
+    assert [event["slug"] for event in first["events"]] == ["note1", "note2"]
+    assert first["truncated"] is True
+    assert first["next_since"] == since + 2
+    assert [event["slug"] for event in rest["events"]] == ["note3"]
+    assert rest["truncated"] is False
+    assert rest["next_since"] is None
+
+
+def test_note_changes_reset_for_other_epoch():
+    epoch = client.get("/notes/changes").json()["epoch"]
+
+    same = client.get("/notes/changes", params={"epoch": epoch})
+    other = client.get("/notes/changes", params={"epoch": "previous-run"})
+
+    assert same.json()["reset"] is False
+    assert other.json()["reset"] is True
+
+
+@pytest.fixture
+def small_limits():
+    app.dependency_overrides[get_limits] = lambda: ResponseLimits(
+        max_batch_slugs=2, max_total_chars=60, max_results=2
+    )
+    yield
+    app.dependency_overrides.clear()
+
+
+def test_list_note_slugs_pages(small_limits):
+    first = client.get("/notes/").json()
+    assert len(first["results"]) == 2
+    assert first["next_offset"] == 2
+
+    second = client.get("/notes/", params={"offset": 2}).json()
+    assert second["next_offset"] is None
+    assert sorted(first["results"] + second["results"]) == [
+        "index",
+        "note1",
+        "note2",
+        "note3",
+    ]
+
+
+def test_search_snippet_chars_are_capped(small_limits):
+    response = client.get(
+        "/notes/search",
+        params={
+            "q": "another",
+            "exact": True,
+            "snippets": True,
+            "snippet_chars": 10**6,
+        },
+    )
+
+    assert response.json()["params"]["snippet_chars"] == 30
+    assert len(response.json()["results"][0]["snippet"]["text"]) <= 30
+
+
+@pytest.mark.parametrize("params", [{"snippet_chars": -5}, {"limit": 0}])
+def test_search_rejects_invalid_params(params):
+    response = client.get("/notes/search", params={"q": "note", **params})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("params", [{"offset": -1}, {"limit": 0}, {"limit": -1}])
+def test_list_note_slugs_rejects_invalid_paging(params):
+    response = client.get("/notes/", params=params)
+
+    assert response.status_code == 422
+
+
+def test_graph_components_are_capped(small_limits):
+    response = client.get("/graph/components", params={"limit": 10})
+
+    results = response.json()["results"]
+    assert len(results) == 2
+    assert results[0]["size"] == 3
+    assert len(results[0]["slugs"]) == 2
+    assert results[0]["truncated"] is True
+    assert results[1]["truncated"] is False
+
+
+def test_batch_details_slug_limit(small_limits):
+    response = client.post("/notes/details", json={"slugs": ["a", "b", "c"]})
+
+    assert response.status_code == 400
+
+
+def test_batch_details_size_limit(small_limits):
+    response = client.post("/notes/details", json={"slugs": ["note1", "note2"]})
+
+    assert response.status_code == 200
+    assert [note["slug"] for note in response.json()["results"]] == ["note1"]
+    assert response.json()["remaining"] == ["note2"]
+
+
+def test_batch_details_truncates_single_large_note(small_limits):
+    response = client.post("/notes/details", json={"slugs": ["note2"]})
+
+    result = response.json()["results"][0]
+    assert len(result["content"]) == 60
+    assert result["truncated"] is True
+    assert response.json()["remaining"] == []
+
+
+def test_relevant_notes_size_limit(small_limits):
+    response = client.get("/notes/note2/relevant", params={"char_limit": 1000})
+
+    assert [note["slug"] for note in response.json()["results"]] == ["note1"]
+    assert response.json()["truncated"] is True
+
+
+def test_large_responses_are_compressed():
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+
+
+def test_graph_stats():
+    response = client.get("/graph/stats")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "notes": 4,
+        "links": 2,
+        "dangling_links": 0,
+        "orphans": 1,
+        "components": 2,
+    }
+
+
+def test_graph_hubs():
+    response = client.get("/graph/hubs", params={"by": "in_degree", "limit": 1})
+
+    assert response.status_code == 200
+    assert response.json()["results"][0]["in_degree"] == 1
+
+
+def test_graph_note_metrics_not_found():
+    response = client.get("/graph/notes/non_existent_note")
+
+    assert response.status_code == 404
+
+
+def test_graph_path():
+    response = client.get("/graph/path", params={"source": "note1", "target": "note3"})
+
+    assert response.status_code == 200
+    assert response.json()["path"] == ["note1", "note2", "note3"]
+    assert response.json()["distance"] == 2
+
+
+def test_graph_neighborhood_not_found():
+    response = client.get("/graph/neighborhood/non_existent_note")
+
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize(
+    "url, params",
+    [
+        ("/graph/path", {"source": "note1", "target": "note3", "max_hops": -1}),
+        ("/graph/path", {"source": "note1", "target": "note3", "max_nodes": 0}),
+        ("/graph/neighborhood/note1", {"max_hops": -1}),
+        ("/graph/neighborhood/note1", {"max_nodes": 0}),
+    ],
+)
+def test_graph_traversal_rejects_invalid_params(url, params):
+    response = client.get(url, params=params)
+
+    assert response.status_code == 422
+
+
+def test_graph_neighborhood_is_capped(small_limits):
+    response = client.get(
+        "/graph/neighborhood/note2", params={"max_hops": 3, "max_nodes": 10**9}
+    )
+
+    assert response.json()["params"]["max_nodes"] == 2
+    assert len(response.json()["nodes"]) == 2
+    assert response.json()["truncated"] is True
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-sv"])
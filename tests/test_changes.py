@@ -0,0 +1,209 @@
+import asyncio
+import os
+
+import pytest
+
+from obsidian_api.changes import ChangeJournal, parse_event_id, stream_changes
+from obsidian_api.vault import ObsidianVault
+
+
+@pytest.fixture
+def vault(tmp_path):
+    (tmp_path / "alpha.md").write_text("Alpha links to [[beta]].")
+    (tmp_path / "beta.md").write_text("Beta note.")
+    return ObsidianVault(directory=str(tmp_path))
+
+
+def touch(path, text):
+    path.write_text(text)
+    stat = path.stat()
+    # Make sure the change is visible even on coarse filesystem timestamps.
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_journal_since():
+    journal = ChangeJournal()
+    journal.record("created", "a")
+    journal.record("modified", "a")
+
+    events, reset = journal.since(1)
+
+    assert [(e["sequence"], e["type"], e["slug"]) for e in events] == [
+        (2, "modified", "a")
+    ]
+    assert reset is False
+    assert journal.since(2) == ([], False)
+
+
+def test_journal_requires_reset_when_events_were_dropped():
+    journal = ChangeJournal(capacity=2)
+    for slug in ["a", "b", "c"]:
+        journal.record("created", slug)
+
+    assert journal.since(0) == ([], True)
+    assert [e["slug"] for e in journal.since(1)[0]] == ["b", "c"]
+
+
+def test_journal_requires_reset_for_unknown_sequence():
+    assert ChangeJournal().since(5) == ([], True)
+
+
+def test_journal_requires_reset_for_other_epoch():
+    journal = ChangeJournal()
+    journal.record("created", "a")
+
+    assert journal.since(0, journal.epoch)[1] is False
+    assert journal.since(0, ChangeJournal().epoch) == ([], True)
+
+
+@pytest.mark.parametrize(
+    "event_id, expected",
+    [("abc:12", ("abc", 12)), ("12", ("", 12)), ("abc:x", ("", 0))],
+)
+def test_parse_event_id(event_id, expected):
+    assert parse_event_id(event_id) == expected
+
+
+def test_refresh_without_changes(vault):
+    assert vault.refresh() == []
+    assert vault.changes.sequence == 0
+
+
+def test_refresh_detects_changes(vault, tmp_path):
+    (tmp_path / "gamma.md").write_text("Gamma mentions zebras.")
+    touch(tmp_path / "alpha.md", "Alpha now links to [[gamma]].")
+    (tmp_path / "beta.md").unlink()
+
+    events = vault.refresh()
+
+    assert sorted(events) == [
+        ("created", "gamma"),
+        ("deleted", "beta"),
+        ("modified", "alpha"),
+    ]
+    assert sorted(vault.notes) == ["alpha", "gamma"]
+    journal = [(e["type"], e["slug"]) for e in vault.changes.since(0)[0]]
+    assert journal[0] == ("deleted", "beta")
+    assert sorted(journal) == sorted(events)
+
+
+def test_refresh_updates_indexes(vault, tmp_path):
+    assert vault.find_path("alpha", "beta") == ["alpha", "beta"]
+
+    (tmp_path / "gamma.md").write_text("Gamma mentions zebras and [[beta]].")
+    (tmp_path / "beta.md").unlink()
+    vault.refresh()
+
+    assert [r["slug"] for r in vault.search_notes("zebras")] == ["gamma"]
+    assert sorted(r["slug"] for r in vault.search_notes("beta")) == ["alpha", "gamma"]
+    assert vault.search_notes("mentions zebras beta")[0]["slug"] == "gamma"
+    assert vault.graph.dangling == [("alpha", "beta"), ("gamma", "beta")]
+
+
+def test_refresh_updates_postings_of_edited_terms(vault, tmp_path):
+    touch(tmp_path / "alpha.md", "Alpha now mentions zebras.")
+    vault.refresh()
+
+    assert [r["slug"] for r in vault.search_notes("zebras")] == ["alpha"]
+    assert vault.search_notes("links") == []
+    assert "links" not in vault.index
+    assert [r["slug"] for r in vault.search_notes("alpha")] == ["alpha"]
+    assert vault._hits("alpha", {"zebras"}) == [(19, "zebras")]
+
+
+def test_prepare_changes_leaves_the_vault_alone(vault, tmp_path):
+    touch(tmp_path / "alpha.md", "Alpha now mentions zebras.")
+    changed, deleted = vault.scan_changes()
+
+    prepared = vault.prepare_changes(changed, deleted)
+
+    assert [entry.note.slug for entry in prepared] == ["alpha"]
+    assert vault.search_notes("zebras") == []
+    assert vault.changes.sequence == 0
+    assert vault.apply_changes(prepared, deleted) == [("modified", "alpha")]
+
+
+def test_refresh_moves_note_to_new_path(vault, tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "beta.md").rename(tmp_path / "sub" / "beta.md")
+
+    assert sorted(vault.refresh()) == [("created", "beta"), ("deleted", "beta")]
+    assert vault.notes["beta"].filepath == str(tmp_path / "sub" / "beta.md")
+    assert [r["slug"] for r in vault.search_notes("beta")] == ["alpha", "beta"]
+
+
+def test_refresh_skips_notes_that_fail_to_load(vault, tmp_path):
+    assert vault.graph.stats()["notes"] == 2
+    (tmp_path / "broken.md").write_bytes(b"\xff\xfe not utf-8")
+    (tmp_path / "bad-yaml.md").write_text("---\ntags: [unclosed\n---\nBody")
+    (tmp_path / "gamma.md").write_text("Gamma.")
+
+    assert vault.refresh() == [("created", "gamma")]
+    assert sorted(vault.notes) == ["alpha", "beta", "gamma"]
+    assert vault.changes.sequence == 1
+    assert vault.graph.stats()["notes"] == 3
+
+    # Broken files are not retried until they change.
+    assert vault.scan_changes() == ([], [])
+    touch(tmp_path / "broken.md", "Fixed now.")
+    assert vault.refresh() == [("created", "broken")]
+    assert vault.notes["broken"].content == "Fixed now."
+
+
+def test_refresh_skips_slug_collisions_until_free(vault, tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "beta.md").write_text("Another beta.")
+
+    assert vault.refresh() == []
+    assert vault.scan_changes() == ([], [])
+
+    (tmp_path / "beta.md").unlink()
+    assert vault.refresh() == [("deleted", "beta")]
+    assert vault.refresh() == [("created", "beta")]
+    assert vault.notes["beta"].content == "Another beta."
+
+
+def test_stream_changes():
+    async def collect():
+        journal = ChangeJournal()
+        journal.record("created", "a")
+        stream = stream_changes(journal, since=0, keep_alive=0.01)
+
+        first = await anext(stream)
+        keep_alive = await anext(stream)
+        journal.record("deleted", "a")
+        second = await anext(stream)
+        return first, keep_alive, second, journal.epoch
+
+    first, keep_alive, second, epoch = asyncio.run(collect())
+
+    assert first.startswith(f"id: {epoch}:1\nevent: change\ndata: ")
+    assert '"slug": "a"' in first
+    assert keep_alive == ": keep-alive\n\n"
+    assert second.startswith(f"id: {epoch}:2\nevent: change\n")
+
+
+def test_stream_changes_reset():
+    async def collect():
+        journal = ChangeJournal()
+        return await anext(stream_changes(journal, since=3)), journal.epoch
+
+    message, epoch = asyncio.run(collect())
+
+    assert message.startswith(f"id: {epoch}:0\nevent: reset\ndata: ")
+
+
+def test_stream_changes_reset_after_restart():
+    async def collect():
+        journal = ChangeJournal()
+        journal.record("created", "a")
+        stream = stream_changes(journal, since=0, epoch="previous-run")
+        return await anext(stream), journal.epoch
+
+    message, epoch = asyncio.run(collect())
+
+    assert message.startswith(f"id: {epoch}:1\nevent: reset\n")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-sv"])
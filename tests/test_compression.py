@@ -0,0 +1,87 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from obsidian_api.compression import CompressionMiddleware, negotiate_encoding
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/large")
+    async def large():
+        return JSONResponse({"content": "x" * 1000})
+
+    @app.get("/small")
+    async def small():
+        return JSONResponse({"content": "x"})
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(
+            iter([b"data: x" * 100]), media_type="text/event-stream"
+        )
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "header, available, expected",
+    [
+        ("gzip, deflate", {"zstd": None, "gzip": None}, "gzip"),
+        ("gzip, zstd", {"zstd": None, "gzip": None}, "zstd"),
+        ("gzip;q=1.0, zstd;q=0.5", {"zstd": None, "gzip": None}, "gzip"),
+        ("zstd", {"gzip": None}, None),
+        ("*", {"gzip": None}, "gzip"),
+        ("gzip;q=0", {"gzip": None}, None),
+        ("", {"gzip": None}, None),
+    ],
+)
+def test_negotiate_encoding(header, available, expected):
+    assert negotiate_encoding(header, available) == expected
+
+
+def test_large_response_is_compressed(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < 1000
+    assert response.json() == {"content": "x" * 1000}
+
+
+def test_small_response_is_not_compressed(client):
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.json() == {"content": "x"}
+
+
+def test_identity_when_not_accepted(client):
+    response = client.get("/large", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in response.headers
+
+
+def test_event_streams_are_not_buffered(client):
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.content == b"data: x" * 100
+
+
+def test_gzip_payload_is_valid(client):
+    with client.stream(
+        "GET", "/large", headers={"Accept-Encoding": "gzip"}
+    ) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert gzip.decompress(raw) == b'{"content":"' + b"x" * 1000 + b'"}'
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-sv"])
@@ -0,0 +1,39 @@
+import pytest
+
+from obsidian_api.diagnostics import deep_sizeof, memory_report
+from obsidian_api.vault import ObsidianVault
+
+
+def test_deep_sizeof_counts_shared_objects_once():
+    shared = "x" * 100
+    containers = [[shared], [shared]]
+    seen = set()
+
+    first = deep_sizeof(containers[0], seen)
+    second = deep_sizeof(containers[1], seen)
+
+    assert first > second > 0
+
+
+def test_memory_report():
+    vault = ObsidianVault(directory="tests/test_data")
+
+    report = memory_report(vault)
+
+    assert report["notes"] == 4
+    assert report["bytes_per_note"] == report["note_bytes"] // 4
+    assert report["note_bytes"] == sum(report["fields"].values())
+    assert set(report["fields"]) == {
+        "object",
+        "slug",
+        "filepath",
+        "frontmatter",
+        "content",
+        "links",
+        "outline",
+    }
+    assert report["search_index_bytes"] > 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-sv"])
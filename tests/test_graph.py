@@ -0,0 +1,120 @@
+import pytest
+
+from obsidian_api.exceptions import NoteMissingException
+from obsidian_api.note import Note
+from obsidian_api.vault import ObsidianVault
+
+
+@pytest.fixture
+def vault():
+    vault = ObsidianVault(directory="test_directory")
+    vault.notes = {
+        "hub": Note("hub", "hub.md", "Links to [[a]], [[b]] and [[missing]]."),
+        "a": Note("a", "a.md", "Back to [[Hub|the hub]] and [[a]] itself."),
+        "b": Note("b", "b.md", "Back to [[hub#Top]]."),
+        "c": Note("c", "c.md", "Links to [[d]]."),
+        "d": Note("d", "d.md", "A leaf with ![[photo.png]]."),
+        "lonely": Note("lonely", "lonely.md", "No links at all."),
+    }
+    vault.build_index()
+    return vault
+
+
+def test_degrees(vault):
+    assert vault.graph.node_metrics("hub") | {"pagerank": None} == {
+        "slug": "hub",
+        "in_degree": 2,
+        "out_degree": 2,
+        "pagerank": None,
+        "component": 0,
+    }
+    assert vault.graph.node_metrics("a")["out_degree"] == 1  # self-link ignored
+
+
+def test_backlinks(vault):
+    graph = vault.graph
+    backlinks = graph.backlinks(graph.index["hub"])
+    assert [graph.slugs[i] for i in backlinks] == ["a", "b"]
+
+
+def test_orphans_and_dangling(vault):
+    assert vault.graph.orphans == ["lonely"]
+    assert vault.graph.dangling == [("hub", "missing")]
+
+
+def test_components(vault):
+    assert vault.graph.components == [["hub", "a", "b"], ["c", "d"], ["lonely"]]
+
+
+def test_pagerank_ranks_hub_first(vault):
+    ranking = vault.graph.top("pagerank", limit=2)
+    assert [note["slug"] for note in ranking] == ["hub", "a"]
+    assert sum(vault.graph.pagerank) == pytest.approx(1.0)
+
+
+def test_graph_is_rebuilt_with_index(vault):
+    before = vault.graph
+    assert vault.graph is before
+
+    vault.notes["d"] = Note("d", "d.md", "Now links to [[lonely]].")
+    vault.build_index()
+
+    assert vault.graph is not before
+    assert vault.graph.orphans == []
+
+
+@pytest.fixture
+def chain():
+    vault = ObsidianVault(directory="test_directory")
+    vault.notes = {
+        f"n{i}": Note(f"n{i}", f"n{i}.md", f"Next is [[n{i + 1}]].") for i in range(6)
+    }
+    vault.notes["shortcut"] = Note("shortcut", "shortcut.md", "See [[n1]], [[n4]].")
+    vault.build_index()
+    return vault
+
+
+def test_shortest_path(chain):
+    assert chain.find_path("n0", "n5") == ["n0", "n1", "shortcut", "n4", "n5"]
+
+
+def test_shortest_path_directed(chain):
+    path = chain.find_path("n0", "n5", directed=True)
+    assert path == ["n0", "n1", "n2", "n3", "n4", "n5"]
+    assert chain.find_path("n5", "n0", directed=True) is None
+
+
+def test_shortest_path_budgets(chain):
+    assert chain.find_path("n0", "n5", max_hops=3) is None
+    assert chain.find_path("n0", "n5", max_nodes=3) is None
+    assert chain.find_path("n2", "n2") == ["n2"]
+
+
+def test_shortest_path_missing_note(chain):
+    with pytest.raises(NoteMissingException):
+        chain.find_path("n0", "nowhere")
+
+
+def test_neighborhood(chain):
+    nodes, edges, truncated = chain.find_neighborhood("n1", max_hops=1)
+
+    assert nodes == [("n1", 0), ("n2", 1), ("n0", 1), ("shortcut", 1)]
+    assert sorted(edges) == [(0, 1), (2, 0), (3, 0)]
+    assert truncated is False
+
+
+def test_neighborhood_directed(chain):
+    nodes, _, _ = chain.find_neighborhood("n1", max_hops=2, directed=True)
+
+    assert nodes == [("n1", 0), ("n2", 1), ("n3", 2)]
+
+
+def test_neighborhood_budget(chain):
+    nodes, _, truncated = chain.find_neighborhood("n1", max_hops=3, max_nodes=2)
+
+    assert len(nodes) == 2
+    assert truncated is True
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-sv"])
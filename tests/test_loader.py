@@ -0,0 +1,100 @@
+import asyncio
+import threading
+
+import pytest
+
+from obsidian_api.loader import VaultLoader, maintain_vault
+from obsidian_api.vault import ObsidianVault
+
+
+def test_loads_once():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return ObsidianVault(directory="tests/test_data")
+
+    loader = VaultLoader(factory)
+    assert loader.ready is False
+
+    assert loader.get() is loader.get()
+    assert calls == [1]
+    assert loader.ready is True
+    assert loader.generation == 1
+
+
+def test_background_warm_up():
+    loader = VaultLoader(lambda: ObsidianVault(directory="tests/test_data"))
+
+    loader.start().join()
+
+    assert loader.ready is True
+    assert loader.generation == 1
+    assert loader.get()._graph is not None
+    assert loader.get()._semantic_index is None
+
+
+def test_requests_wait_for_warm_up():
+    release = threading.Event()
+
+    def factory():
+        release.wait()
+        return ObsidianVault(directory="tests/test_data")
+
+    loader = VaultLoader(factory)
+    thread = loader.start()
+    assert loader.ready is False
+
+    release.set()
+    vault = loader.get()
+    thread.join()
+
+    assert loader.get() is vault
+    assert loader.generation == 1
+
+
+def test_load_failure_is_recorded():
+    def factory():
+        raise OSError("vault missing")
+
+    loader = VaultLoader(factory)
+    loader.start().join()
+
+    assert loader.ready is False
+    assert isinstance(loader.error, OSError)
+    with pytest.raises(OSError):
+        loader.get()
+
+
+def test_refresh_bumps_generation(tmp_path):
+    (tmp_path / "a.md").write_text("First note.")
+    loader = VaultLoader(lambda: ObsidianVault(directory=str(tmp_path)))
+
+    async def refresh_once():
+        task = asyncio.create_task(maintain_vault(loader, 0.01))
+        await asyncio.sleep(0.05)
+        (tmp_path / "b.md").write_text("Second note.")
+        for _ in range(100):
+            if loader.generation > 1:
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+
+    asyncio.run(refresh_once())
+
+    assert loader.generation == 2
+    assert sorted(loader.get().notes) == ["a", "b"]
+    assert sorted(loader.get().semantic_index.slugs) == ["a", "b"]
+
+
+def test_maintenance_builds_semantic_index_without_refreshing():
+    loader = VaultLoader(lambda: ObsidianVault(directory="tests/test_data"))
+
+    asyncio.run(maintain_vault(loader, 0))
+
+    assert loader.generation == 1
+    assert len(loader.get().semantic_index.slugs) == 4
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-sv"])
@@ -1,7 +1,7 @@
 import pytest
 
 from obsidian_api.exceptions import NoteMissingException
-from obsidian_api.note import Note
+from obsidian_api.note import Note, parse_links
 from obsidian_api.vault import ObsidianVault
 
 FRONTMATTER1 = """---
@@ -49,7 +49,6 @@ def test_note_initialization(slug, filename, frontmatter):
         filename=filename,
         text=text,
     )
-    assert note.text == text
     assert note.content == content
     assert note.frontmatter == {
         "title": "About Me",
@@ -60,11 +59,60 @@ def test_note_initialization(slug, filename, frontmatter):
     assert note.filename == filename.split("/")[-1]
 
 
+def test_note_is_slotted(sample_note):
+    assert not hasattr(sample_note, "__dict__")
+    with pytest.raises(AttributeError):
+        sample_note.extra = True
+
+
+def test_frontmatter_is_interned():
+    first = Note("a", "a.md", f"{FRONTMATTER1}\nFirst")
+    second = Note("b", "b.md", f"{FRONTMATTER2}\nSecond")
+
+    first_tags = first.frontmatter["tags"]
+    second_tags = second.frontmatter["tags"]
+    assert first_tags == second_tags
+    assert all(a is b for a, b in zip(first_tags, second_tags))
+    assert list(first.frontmatter)[1] is list(second.frontmatter)[1]
+
+
 def test_extract_links(sample_note):
     links = sample_note.extract_links()
     assert links == ["projects", "hobbies"]
 
 
+@pytest.mark.parametrize(
+    "content, expected_links",
+    [
+        ("[[projects|My Projects]]", ["projects"]),
+        ("[[projects#Current work]]", ["projects"]),
+        ("[[projects#^block-id]]", ["projects"]),
+        ("![[diagram]] and ![[photo.png]]", ["diagram"]),
+        ("![[Scan.PDF]], [[board.canvas]] and [[v1.2 release]]", ["v1.2 release"]),
+        ("[[png]]", ["png"]),
+        ("[[work/projects.md]]", ["projects"]),
+        ("| [[projects\\|table alias]] |", ["projects"]),
+        ("[[#Local heading]]", []),
+        ("[[projects]], [[projects|again]] and [[hobbies]]", ["projects", "hobbies"]),
+        ("[[Projects]] then [[projects]]", ["Projects"]),
+    ],
+)
+def test_parse_links(content, expected_links):
+    assert parse_links(content) == expected_links
+
+
+def test_links_resolve_case_insensitively():
+    vault = ObsidianVault(directory="test_directory")
+    vault.notes = {
+        "Projects": Note("Projects", "Projects.md", "See [[hobbies|my hobbies]]."),
+        "hobbies": Note("hobbies", "hobbies.md", "Back to ![[projects#Top]]."),
+    }
+    vault.build_index()
+
+    results = vault.find_relevant_notes("hobbies", max_hops=1, char_limit=10)
+    assert [note["slug"] for note in results] == ["Projects"]
+
+
 def test_find_relevant_notes(vault):
     relevant_notes = vault.find_relevant_notes(slug="note2", max_hops=2, char_limit=100)
     assert isinstance(relevant_notes, list)
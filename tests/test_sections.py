@@ -0,0 +1,110 @@
+import pytest
+
+from obsidian_api.exceptions import NoteChangedException, SectionMissingException
+from obsidian_api.note import Note, parse_outline
+from obsidian_api.vault import ObsidianVault
+
+GUIDE = """---
+title: Guide
+---
+Intro text.
+
+# Setup
+Install things.
+
+## Linux
+Use apt.
+
+```bash
+# not a heading
+```
+
+# Usage
+Run it.
+"""
+
+
+@pytest.fixture
+def vault(tmp_path):
+    (tmp_path / "guide.md").write_text(GUIDE)
+    (tmp_path / "windows.md").write_bytes(
+        b"# First\r\nline one\r\n# Second\r\nline two\r\n"
+    )
+    return ObsidianVault(directory=str(tmp_path))
+
+
+def test_parse_outline():
+    outline = parse_outline(GUIDE.encode())
+
+    assert [(s.level, s.title, s.line) for s in outline] == [
+        (0, "", 4),
+        (1, "Setup", 6),
+        (2, "Linux", 9),
+        (1, "Usage", 16),
+    ]
+    setup = outline[1]
+    assert GUIDE.encode()[setup.start : setup.end].decode().startswith("# Setup")
+    assert setup.end == outline[3].start
+
+
+def test_outline_computed_from_text():
+    note = Note("guide", "guide.md", GUIDE)
+
+    assert note.outline == tuple(parse_outline(GUIDE.encode()))
+
+
+def test_read_section_by_heading(vault):
+    part = vault.read_note_section("guide", heading="linux")
+
+    assert part["content"] == "## Linux\nUse apt.\n\n```bash\n# not a heading\n```\n\n"
+    assert part["truncated"] is False
+
+
+def test_read_section_missing_heading(vault):
+    with pytest.raises(SectionMissingException):
+        vault.read_note_section("guide", heading="Nowhere")
+
+
+def test_read_lines(vault):
+    part = vault.read_note_section("guide", start_line=6, end_line=7)
+
+    assert part["content"] == "# Setup\nInstall things.\n"
+
+
+def test_read_bytes_with_crlf_offsets(vault):
+    note = vault.fetch_note_by_slug("windows")
+    second = note.find_section("Second")
+
+    part = vault.read_note_section(
+        "windows", start_byte=second.start, end_byte=second.end
+    )
+
+    assert part["content"] == "# Second\nline two\n"
+
+
+def test_read_with_budget(vault):
+    part = vault.read_note_section("guide", heading="Setup", max_chars=7)
+
+    assert part["content"] == "# Setup"
+    assert part["truncated"] is True
+
+
+def test_read_whole_content_with_budget(vault):
+    part = vault.read_note_section("guide", max_chars=5)
+
+    assert part == {"content": "Intro", "truncated": True}
+
+
+def test_read_section_of_changed_file(vault, tmp_path):
+    (tmp_path / "guide.md").write_text("# Setup\nRewritten.\n")
+
+    with pytest.raises(NoteChangedException):
+        vault.read_note_section("guide", heading="Usage")
+
+    vault.refresh()
+    part = vault.read_note_section("guide", heading="Setup")
+    assert part["content"] == "# Setup\nRewritten.\n"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-sv"])
@@ -0,0 +1,92 @@
+import pytest
+
+from obsidian_api.exceptions import IndexNotReadyException, NoteMissingException
+from obsidian_api.note import Note
+from obsidian_api.semantic import HashingEmbedder, SemanticIndex
+from obsidian_api.vault import ObsidianVault
+
+
+@pytest.fixture
+def vault():
+    vault = ObsidianVault(directory="test_directory")
+    vault.notes = {
+        "ml": Note("ml", "ml.md", "Neural networks learn weights from training data."),
+        "dl": Note("dl", "dl.md", "Deep neural networks stack many layers."),
+        "cooking": Note("cooking", "cooking.md", "Bake bread with flour and yeast."),
+    }
+    vault.build_index()
+    vault.build_semantic_index()
+    return vault
+
+
+def test_embedder_is_deterministic():
+    embedder = HashingEmbedder(dimensions=16)
+    vector = embedder("Neural networks")
+
+    assert len(vector) == 16
+    assert vector == embedder("neural NETWORKS")
+    assert embedder("the of and") == [0.0] * 16
+
+
+def test_semantic_search(vault):
+    results = vault.semantic_search_notes("training neural networks")
+
+    assert [result["slug"] for result in results] == ["ml", "dl"]
+    assert results[0]["score"] > results[1]["score"] > 0
+
+
+def test_similar_notes_excludes_itself(vault):
+    results = vault.find_similar_notes("dl", limit=5)
+
+    assert [result["slug"] for result in results] == ["ml"]
+
+
+def test_semantic_index_not_built():
+    vault = ObsidianVault(directory="tests/test_data")
+
+    with pytest.raises(IndexNotReadyException):
+        vault.semantic_search_notes("note")
+
+
+def test_similar_notes_missing(vault):
+    with pytest.raises(NoteMissingException):
+        vault.find_similar_notes("nowhere")
+
+
+def test_index_is_updated_incrementally(vault):
+    index = vault.semantic_index
+    embedded = []
+    original = index.embedder
+
+    def counting_embedder(text):
+        embedded.append(text)
+        return original(text)
+
+    counting_embedder.dimensions = original.dimensions
+    index.embedder = counting_embedder
+
+    vault.notes["bread"] = Note("bread", "bread.md", "Sourdough bread needs yeast.")
+    del vault.notes["ml"]
+    vault.build_index()
+
+    assert embedded == ["Sourdough bread needs yeast."]
+    assert sorted(index.slugs) == ["bread", "cooking", "dl"]
+    assert len(index.matrix) == 3 * index.dimensions
+    assert [r["slug"] for r in vault.find_similar_notes("bread")] == ["cooking"]
+
+
+def test_remove_moves_last_row():
+    index = SemanticIndex(HashingEmbedder(dimensions=8))
+    for slug in ["a", "b", "c"]:
+        index.update(slug, f"word{slug}")
+    last_row = index.matrix[2 * 8 :]
+
+    index.remove("a")
+
+    assert index.slugs == ["c", "b"]
+    assert index.rows == {"c": 0, "b": 1}
+    assert index.matrix[:8] == last_row
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-sv"])
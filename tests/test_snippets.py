@@ -0,0 +1,102 @@
+import pytest
+
+from obsidian_api.note import Note
+from obsidian_api.snippets import make_snippet
+from obsidian_api.vault import ObsidianVault
+
+LONG_NOTE = (
+    "Gardening notes. " * 10
+    + "Tomatoes need full sun and regular watering. "
+    + "Compost improves the soil. " * 10
+)
+
+
+@pytest.fixture
+def vault():
+    vault = ObsidianVault(directory="test_directory")
+    vault.notes = {
+        "garden": Note("garden", "garden.md", LONG_NOTE),
+        "short": Note("short", "short.md", "Water the tomatoes."),
+    }
+    vault.build_index()
+    return vault
+
+
+def test_snippet_window_centres_on_matches():
+    content = "aaa bbb ccc target ddd eee fff"
+    snippet = make_snippet(content, [(12, "target")], max_chars=16)
+
+    assert snippet["text"] == "ccc target ddd"
+    start, end = snippet["highlights"][0]
+    assert snippet["text"][start:end] == "target"
+
+
+def test_snippet_prefers_region_with_most_terms():
+    content = "alpha " + "x " * 50 + "alpha beta"
+    hits = [(0, "alpha"), (106, "alpha"), (112, "beta")]
+
+    snippet = make_snippet(content, hits, max_chars=20)
+
+    assert snippet["text"].endswith("alpha beta")
+    assert len(snippet["highlights"]) == 2
+
+
+def test_snippet_without_hits():
+    assert make_snippet("Some content", [], max_chars=4) == {
+        "text": "Some",
+        "highlights": [],
+    }
+
+
+def test_search_with_snippets(vault):
+    results = vault.search_notes("tomatoes watering", snippet_chars=60)
+
+    assert [result["slug"] for result in results] == ["garden"]
+    snippet = results[0]["snippet"]
+    assert len(snippet["text"]) <= 60
+    assert "Tomatoes need full sun and regular watering." in snippet["text"]
+    assert [snippet["text"][a:b] for a, b in snippet["highlights"]] == [
+        "Tomatoes",
+        "watering",
+    ]
+
+
+def test_fuzzy_search_with_snippets(vault):
+    results = vault.fuzzy_search_notes("tomato", snippet_chars=40)
+
+    snippets = {result["slug"]: result["snippet"] for result in results}
+    assert snippets["short"] == {
+        "text": "Water the tomatoes.",
+        "highlights": [(10, 18)],
+    }
+
+
+def test_positions_are_sorted_by_term(vault):
+    positions = vault.positions["short"]
+    water, tomatoes = vault.term_ids["water"], vault.term_ids["tomatoes"]
+
+    assert positions.typecode == "I"
+    # "tomatoes" got its id from the first note, so its offset comes first.
+    assert list(positions) == [tomatoes, water, 10, 0]
+    assert vault._hits("short", {"tomatoes", "water", "sun"}) == [
+        (0, "water"),
+        (10, "tomatoes"),
+    ]
+    assert vault.index["tomatoes"] == ["garden", "short"]
+
+
+def test_hits_for_repeated_terms(vault):
+    vault.notes["repeat"] = Note("repeat", "repeat.md", "Sun, rain, sun and sun.")
+    vault.build_index()
+
+    assert vault._hits("repeat", {"sun"}) == [(0, "sun"), (11, "sun"), (19, "sun")]
+    assert vault._hits("repeat", {"tomatoes"}) == []
+    assert vault._hits("nowhere", {"sun"}) == []
+
+
+def test_search_without_snippets(vault):
+    assert "snippet" not in vault.search_notes("tomatoes")[0]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-sv"])
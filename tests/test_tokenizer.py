@@ -0,0 +1,100 @@
+import pytest
+
+from obsidian_api.note import Note
+from obsidian_api.tokenizer import DEFAULT_STAGES, Analyzer, stem
+from obsidian_api.vault import ObsidianVault
+
+
+@pytest.fixture
+def analyzer():
+    return Analyzer()
+
+
+def test_tokens_are_lowercased_with_offsets(analyzer):
+    assert list(analyzer.tokens("Python Notes")) == [("python", 0), ("notes", 7)]
+
+
+def test_stopwords_are_removed(analyzer):
+    assert analyzer.terms("This is the first note") == {"first", "note"}
+
+
+def test_unicode_is_normalized(analyzer):
+    assert analyzer.terms("ﬁle Ｐython") == {"file", "python"}
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "```python\nimport secret\n```\nvisible",
+        "~~~\nimport secret\n~~~\nvisible",
+        "visible `secret()`",
+        "[visible](https://example.com/secret)",
+        "visible https://example.com/secret",
+    ],
+)
+def test_markdown_noise_is_skipped(analyzer, text):
+    assert analyzer.terms(text) == {"visible"}
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Café Notes about the ﬁle",
+        "plain ascii then `code` then Ünïcode words",
+    ],
+)
+def test_terms_match_tokens(analyzer, text):
+    assert analyzer.terms(text) == {term for term, _ in analyzer.tokens(text)}
+
+
+def test_offsets_in_non_ascii_text(analyzer):
+    text = "`skip` Straße and Café"
+    assert [
+        (term, text[offset : offset + 5]) for term, offset in analyzer.tokens(text)
+    ] == [
+        ("strasse", "Straß"),
+        ("café", "Café"),
+    ]
+
+
+def test_markdown_skipping_can_be_disabled():
+    analyzer = Analyzer(skip_markdown=False)
+    assert "secret" in analyzer.terms("visible `secret`")
+
+
+def test_stemming_stage():
+    analyzer = Analyzer(stages=DEFAULT_STAGES + (stem,))
+    assert analyzer.terms("Linking linked links") == {"link"}
+    assert analyzer.terms("This is it") == set()  # stopwords go before stemming
+
+
+def test_counts(analyzer):
+    assert analyzer.counts("Notes, more notes and `code` notes") == {
+        "notes": 3,
+        "more": 1,
+    }
+
+
+@pytest.mark.parametrize(
+    "term, expected",
+    [("notes", "note"), ("class", "class"), ("queries", "query"), ("go", "go")],
+)
+def test_stem(term, expected):
+    assert stem(term) == expected
+
+
+def test_query_uses_same_pipeline():
+    vault = ObsidianVault(directory="test_directory")
+    vault.notes = {
+        "note1": Note("note1", "note1.md", "Machine Learning basics"),
+        "note2": Note("note2", "note2.md", "Learning to cook"),
+    }
+    vault.build_index()
+
+    assert [r["slug"] for r in vault.search_notes("LEARNING")] == ["note1", "note2"]
+    assert [r["slug"] for r in vault.search_notes("machine learning")] == ["note1"]
+    assert vault.search_notes("the") == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-sv"])
@@ -52,5 +52,17 @@ def test_search_notes_no_match(vault):
     assert result == [], "Should return an empty list for non-existent word search."
 
 
+def test_fuzzy_search_ranks_notes_matching_more_terms_first(vault):
+    result = vault.fuzzy_search_notes("diferent contnt")
+
+    assert [note["slug"] for note in result] == ["note2", "note1", "note3"]
+
+
+def test_fuzzy_search_truncates_in_rank_order(vault):
+    result = vault.fuzzy_search_notes("note", max_results=2)
+
+    assert [note["slug"] for note in result] == ["note1", "note2"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-sv"])